@@ -4,6 +4,7 @@ import argparse
 import re
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 
@@ -29,6 +30,175 @@ class Compilation:
     blocks: Dict[int, Block]
 
 
+BLOCK_RE = re.compile(r"Block\s+(\d+)")
+FOUND_MARKER_RE = re.compile(r"Found in this block\s*:\s*(?:class\s+)?(.+)$")
+LOOP_ID_RE = re.compile(r"LoopID:\s*(\d+)")
+# HEADERS key of a line: up to the first whitespace, or through the first ':'
+# ("Successors:5" -> "Successors:", "Block 3" -> "Block")
+HEADER_KEY_RE = re.compile(r"[^\s:]*:?")
+
+
+class DebugOutputParser:
+    """
+    Line-by-line state machine behind parse_debug_output.
+
+    Header lines are recognised by their first token (see HEADER_KEY_RE)
+    through HEADERS, so each line costs one dict lookup instead of a chain of
+    startswith checks; all other lines are handled according to the current
+    mode.
+    """
+
+    def __init__(self):
+        self.comps: List[Compilation] = []
+        self.in_comp = False
+        self.comp_name: Optional[str] = None
+        self.blocks: Dict[int, Block] = {}
+        self.current_block: Optional[Block] = None
+        self.mode: Optional[str] = None  # "succ", "pred", "src", "bubo", or None
+
+        # NEW: track the last marker class inside a block so LoopID can attach to it
+        self.last_marker_class: Optional[str] = None
+
+    def feed(self, line: str) -> None:
+        for prefix, handler in self.HEADERS.get(HEADER_KEY_RE.match(line).group(), ()):
+            if line.startswith(prefix) and (self.in_comp or handler is DebugOutputParser._start):
+                handler(self, line)
+                return
+
+        if not self.in_comp or self.current_block is None:
+            return
+
+        content = self.CONTENT.get(self.mode)
+        if content is not None:
+            content(self, line)
+        # mode == "pred" or None: ignore
+
+    # -- header lines --------------------------------------------------------
+
+    def _start(self, line: str) -> None:
+        self.in_comp = True
+        self.comp_name = None
+        self.blocks = {}
+        self.current_block = None
+        self.mode = None
+        self.last_marker_class = None
+
+    def _end(self, line: str) -> None:
+        if self.comp_name is None:
+            self.comp_name = "<unknown-compilation>"
+        self.comps.append(Compilation(name=self.comp_name, blocks=self.blocks))
+        self.in_comp = False
+        self.current_block = None
+        self.mode = None
+        self.last_marker_class = None
+
+    def _compilation(self, line: str) -> None:
+        self.comp_name = line[len("Compilation: "):].strip()
+
+    def _ignore(self, line: str) -> None:
+        pass
+
+    def _block(self, line: str) -> None:
+        # Block header
+        m = BLOCK_RE.match(line)
+        if not m:
+            return
+        bid = int(m.group(1))
+        self.current_block = Block(bid)
+        self.blocks[bid] = self.current_block
+        self.mode = None
+        self.last_marker_class = None
+
+    def _successors(self, line: str) -> None:
+        self.mode = "succ"
+
+    def _predecessors(self, line: str) -> None:
+        self.mode = "pred"
+
+    def _in_loop(self, line: str) -> None:
+        if self.current_block is not None:
+            val = line[len("In loop:"):].strip()
+            self.current_block.loop = None if val == "<none>" else val
+
+    def _sources(self, line: str) -> None:
+        self.mode = "src"
+
+    def _bubo(self, line: str) -> None:
+        # Bubo marker section
+        self.mode = "bubo"
+        self.last_marker_class = None
+
+    HEADERS = {
+        "===": (
+            ("=== HumphreysDebugDataPhase ===", _start),
+            ("=== End HumphreysDebugDataPhase ===", _end),
+        ),
+        "Compilation:": (("Compilation: ", _compilation),),
+        "Number": (("Number of loops:", _ignore),),
+        "Block": (("Block ", _block),),
+        "Successors:": (("Successors:", _successors),),
+        "Predecessors:": (("Predecessors:", _predecessors),),
+        "In": (("In loop:", _in_loop),),
+        "Source": (("Source positions in block:", _sources),),
+        "BuboLoopMakers:": (("BuboLoopMakers:", _bubo),),
+    }
+
+    # -- content lines, by mode ----------------------------------------------
+
+    def _succ_line(self, line: str) -> None:
+        # Lines like "-> 5"
+        if "->" in line:
+            succ_str = line.split("->", 1)[1].strip()
+            if succ_str:
+                try:
+                    self.current_block.successors.append(int(succ_str))
+                except ValueError:
+                    pass
+
+    def _src_line(self, line: str) -> None:
+        if line and line != "<none>":
+            self.current_block.sources.append(line)
+
+    def _bubo_line(self, line: str) -> None:
+        # Typical lines:
+        #   Found in this block : class jdk.graal.compiler.lir.amd64.Bubo.AMD64BuboRDTSCToSlot
+        #   Found in this block : class jdk.graal.compiler.lir.amd64.Bubo.AMD64BuboWriteDeltaRDTSC
+        #   LoopID: 0
+        if not line:
+            return
+
+        block = self.current_block
+        block.bubo_lines.append(line)
+
+        # Marker class line
+        m = FOUND_MARKER_RE.search(line)
+        if m:
+            cls = m.group(1).strip()
+            block.marker_classes.append(cls)
+            self.last_marker_class = cls
+
+            # Highlight RDTSC/RDTSCP/RDTCP-ish markers
+            u = cls.upper()
+            if "RDTSC" in u or "RDTSCP" in u or "RDTCP" in u:
+                block.has_rdtsc = True
+
+            # Best-effort "GT marker" detection (tweak to your exact class names if needed)
+            if "GT" in u or "SLOWDOWN" in u or "GTSLOW" in u:
+                block.has_gt_marker = True
+            return
+
+        # LoopID line (applies to the immediately previous marker)
+        m = LOOP_ID_RE.match(line)
+        if m and self.last_marker_class is not None:
+            block.marker_loop_ids[self.last_marker_class] = int(m.group(1))
+
+    CONTENT = {
+        "succ": _succ_line,
+        "src": _src_line,
+        "bubo": _bubo_line,
+    }
+
+
 def parse_debug_output(text: str) -> List[Compilation]:
     """
     Parse HumphreysDebugDataPhase console output into a list of Compilation objects.
@@ -39,236 +209,96 @@ def parse_debug_output(text: str) -> List[Compilation]:
           Found in this block : class ...
           LoopID: <n>  (applies to the immediately previous marker)
     """
-    lines = text.splitlines()
-    comps: List[Compilation] = []
-
-    in_comp = False
-    comp_name: Optional[str] = None
-    blocks: Dict[int, Block] = {}
-    current_block: Optional[Block] = None
-    mode: Optional[str] = None  # "succ", "pred", "src", "bubo", or None
-
-    # NEW: track the last marker class inside a block so LoopID can attach to it
-    last_marker_class: Optional[str] = None
-
-    for raw in lines:
-        line = raw.strip()
-
-        if line.startswith("=== HumphreysDebugDataPhase ==="):
-            in_comp = True
-            comp_name = None
-            blocks = {}
-            current_block = None
-            mode = None
-            last_marker_class = None
-            continue
-
-        if not in_comp:
-            continue
-
-        if line.startswith("=== End HumphreysDebugDataPhase ==="):
-            if comp_name is None:
-                comp_name = "<unknown-compilation>"
-            comps.append(Compilation(name=comp_name, blocks=blocks))
-            in_comp = False
-            current_block = None
-            mode = None
-            last_marker_class = None
-            continue
-
-        if line.startswith("Compilation: "):
-            comp_name = line[len("Compilation: "):].strip()
-            continue
-
-        if line.startswith("Number of loops:"):
-            continue
+    parser = DebugOutputParser()
+    for raw in text.splitlines():
+        parser.feed(raw.strip())
+    return parser.comps
 
-        # Block header
-        if line.startswith("Block "):
-            m = re.match(r"Block\s+(\d+)", line)
-            if not m:
-                continue
-            bid = int(m.group(1))
-            current_block = Block(bid)
-            blocks[bid] = current_block
-            mode = None
-            last_marker_class = None
-            continue
-
-        if line.startswith("Successors:"):
-            mode = "succ"
-            continue
-
-        if line.startswith("Predecessors:"):
-            mode = "pred"
-            continue
-
-        if line.startswith("In loop:"):
-            if current_block is not None:
-                val = line[len("In loop:"):].strip()
-                current_block.loop = None if val == "<none>" else val
-            continue
-
-        if line.startswith("Source positions in block:"):
-            mode = "src"
-            continue
 
-        # Bubo marker section
-        if line.startswith("BuboLoopMakers:"):
-            mode = "bubo"
-            last_marker_class = None
-            continue
-
-        # Content depending on mode
-        if current_block is None:
-            continue
-
-        if mode == "succ":
-            # Lines like "-> 5"
-            if "->" in line:
-                succ_str = line.split("->", 1)[1].strip()
-                if succ_str:
-                    try:
-                        current_block.successors.append(int(succ_str))
-                    except ValueError:
-                        pass
-            continue
-
-        if mode == "src":
-            if line and line != "<none>":
-                current_block.sources.append(line)
-            continue
-
-        if mode == "bubo":
-            # Typical lines:
-            #   Found in this block : class jdk.graal.compiler.lir.amd64.Bubo.AMD64BuboRDTSCToSlot
-            #   Found in this block : class jdk.graal.compiler.lir.amd64.Bubo.AMD64BuboWriteDeltaRDTSC
-            #   LoopID: 0
-            if not line:
-                continue
-
-            current_block.bubo_lines.append(line)
-
-            # Marker class line
-            m = re.search(r"Found in this block\s*:\s*(?:class\s+)?(.+)$", line)
-            if m:
-                cls = m.group(1).strip()
-                current_block.marker_classes.append(cls)
-                last_marker_class = cls
-
-                # Highlight RDTSC/RDTSCP/RDTCP-ish markers
-                u = cls.upper()
-                if "RDTSC" in u or "RDTSCP" in u or "RDTCP" in u:
-                    current_block.has_rdtsc = True
-
-                # Best-effort "GT marker" detection (tweak to your exact class names if needed)
-                if "GT" in u or "SLOWDOWN" in u or "GTSLOW" in u:
-                    current_block.has_gt_marker = True
-                continue
-
-            # LoopID line (applies to the immediately previous marker)
-            m = re.match(r"LoopID:\s*(\d+)", line)
-            if m and last_marker_class is not None:
-                current_block.marker_loop_ids[last_marker_class] = int(m.group(1))
-                continue
-
-            continue
+_GV_ESCAPES = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n"})
 
-        # mode == "pred" or None: ignore
 
-    return comps
+@lru_cache(maxsize=16384)
+def gv_escape(s: str) -> str:
+    return s.translate(_GV_ESCAPES)
 
 
-def gv_escape(s: str) -> str:
-    s = s.replace("\\", "\\\\")
-    s = s.replace("\"", "\\\"")
-    s = s.replace("\n", "\\n")
-    return s
+PALETTE = [
+    "lightblue", "lightgreen", "lightpink", "gold", "orange",
+    "violet", "khaki", "plum", "lightcyan", "lightcoral"
+]
 
 
-def compilation_to_dot(comp: Compilation, comp_index: int) -> str:
-    out: List[str] = []
-
-    graph_name = f"CFG_{comp_index}"
-    out.append(f"digraph {graph_name} {{")
-    out.append("  rankdir=LR;")
-    out.append("  graph [fontsize=20, ranksep=1.5, nodesep=1.0, overlap=false, splines=true];")
-    out.append("  node [shape=box, style=filled, fontname=\"Helvetica\", fontsize=10];")
-    out.append(f"  label=\"{gv_escape(comp.name)}\";")
-    out.append("  labelloc=top;")
-    out.append("  labeljust=left;")
-
-    palette = [
-        "lightblue", "lightgreen", "lightpink", "gold", "orange",
-        "violet", "khaki", "plum", "lightcyan", "lightcoral"
-    ]
+def block_to_dot(bid: int, block: Block, loop_color: Dict[str, str]) -> str:
+    """Return the DOT node statement for one block."""
+    # Label
+    label_lines = [f"B{bid}", f"Loop: {block.loop if block.loop is not None else '<none>'}"]
 
-    loop_ids = sorted({b.loop for b in comp.blocks.values() if b.loop is not None})
-    loop_color = {loop: palette[i % len(palette)] for i, loop in enumerate(loop_ids)}
-
-    for bid, block in sorted(comp.blocks.items()):
-        node_name = f"b{bid}"
-
-        # Label
-        label_lines = [f"B{bid}"]
-        label_lines.append(f"Loop: {block.loop if block.loop is not None else '<none>'}")
-
-        if block.sources:
-            label_lines.append("---")
-            label_lines.extend(block.sources)
-
-        # Show marker info (below everything else)
-        if block.marker_classes or block.bubo_lines:
-            label_lines.append("---")
-            label_lines.append("BuboLoopMakers:")
-
-            if block.marker_classes:
-                for cls in block.marker_classes:
-                    short = cls.split(".")[-1]
-                    if cls in block.marker_loop_ids:
-                        label_lines.append(f"  {short} (LoopID={block.marker_loop_ids[cls]})")
-                    else:
-                        label_lines.append(f"  {short}")
-            else:
-                # Fallback: show raw bubo lines if we didn't parse classes
-                label_lines.extend([f"  {x}" for x in block.bubo_lines])
-
-        label = gv_escape("\n".join(label_lines))
-
-        # Fill color by loop
-        fill = "white" if block.loop is None else loop_color.get(block.loop, "white")
-
-        # Styling for special blocks
-        attrs = {
-            "label": f"\"{label}\"",
-            "fillcolor": f"\"{fill}\"",
-        }
-
-        # RDTSC/RDTSCP blocks: thick border + double border
-        if block.has_rdtsc:
-            attrs["penwidth"] = "4"
-            attrs["peripheries"] = "2"  # double border
-
-        # GT marker blocks: red border + double border
+    if block.sources:
+        label_lines.append("---")
+        label_lines.extend(block.sources)
+
+    # Show marker info (below everything else)
+    if block.marker_classes or block.bubo_lines:
+        label_lines.append("---")
+        label_lines.append("BuboLoopMakers:")
+
+        if block.marker_classes:
+            label_lines.extend(
+                f"  {cls.split('.')[-1]} (LoopID={block.marker_loop_ids[cls]})"
+                if cls in block.marker_loop_ids else f"  {cls.split('.')[-1]}"
+                for cls in block.marker_classes
+            )
+        else:
+            # Fallback: show raw bubo lines if we didn't parse classes
+            label_lines.extend(f"  {x}" for x in block.bubo_lines)
+
+    label = gv_escape("\n".join(label_lines))
+
+    # Fill color by loop
+    fill = "white" if block.loop is None else loop_color.get(block.loop, "white")
+
+    attr_str = f"label=\"{label}\", fillcolor=\"{fill}\""
+
+    # RDTSC/RDTSCP blocks: thick border + double border
+    # GT marker blocks: red border + double border
+    if block.has_rdtsc:
+        attr_str += ", penwidth=4, peripheries=2"
         if block.has_gt_marker:
-            attrs["color"] = "\"red\""
-            attrs["penwidth"] = "4"
-            attrs["peripheries"] = "2"
+            attr_str += ", color=\"red\""
+    elif block.has_gt_marker:
+        attr_str += ", color=\"red\", penwidth=4, peripheries=2"
 
-        attr_str = ", ".join(f"{k}={v}" for k, v in attrs.items())
-        out.append(f"  {node_name} [{attr_str}];")
+    return f"  b{bid} [{attr_str}];"
 
-    # Edges
-    for bid, block in sorted(comp.blocks.items()):
-        src_name = f"b{bid}"
-        for succ in block.successors:
-            if succ in comp.blocks:
-                out.append(f"  {src_name} -> b{succ};")
 
-    out.append("}")
-    return "\n".join(out)
+def compilation_to_dot(comp: Compilation, comp_index: int) -> str:
+    loop_ids = sorted({b.loop for b in comp.blocks.values() if b.loop is not None})
+    loop_color = {loop: PALETTE[i % len(PALETTE)] for i, loop in enumerate(loop_ids)}
+
+    blocks = sorted(comp.blocks.items())
+
+    header = "\n".join([
+        f"digraph CFG_{comp_index} {{",
+        "  rankdir=LR;",
+        "  graph [fontsize=20, ranksep=1.5, nodesep=1.0, overlap=false, splines=true];",
+        "  node [shape=box, style=filled, fontname=\"Helvetica\", fontsize=10];",
+        f"  label=\"{gv_escape(comp.name)}\";",
+        "  labelloc=top;",
+        "  labeljust=left;",
+    ])
+    nodes = [block_to_dot(bid, block, loop_color) for bid, block in blocks]
+    edges = [
+        f"  b{bid} -> b{succ};"
+        for bid, block in blocks
+        for succ in block.successors
+        if succ in comp.blocks
+    ]
+
+    return "\n".join([header, *nodes, *edges, "}"])
 
 
+@lru_cache(maxsize=16384)
 def sanitize_name(name: str) -> str:
     base = re.sub(r"[^0-9A-Za-z._]+", "_", name)
     if len(base) > 80:
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 import os
 import csv
+import hashlib
+import pickle
 import re
 import subprocess
+import tempfile
 from collections import defaultdict
-from typing import Dict, Tuple, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, Tuple, List, Optional
 
 # ============================================================
 # Config defaults (override via CLI flags)
@@ -98,9 +104,12 @@ def pick_method_from_stack(frames_top_first: List[str]) -> Optional[str]:
 # Async GTAssignDebug tree parsing (method-based)
 # ============================================================
 
-_ASYNC_TOTAL_RE = re.compile(r"\s*Total samples\s*:\s*(\d+)")
-_ASYNC_BLOCK_RE = re.compile(r"^---\s+.*,\s*(\d+)\s+samples")
-_ASYNC_FRAME_RE = re.compile(r"\s*\[\s*\d+\]\s+(.+)")
+# All patterns run over the whole file; [^\S\n] keeps each match on one line
+_ASYNC_TOTAL_RE = re.compile(r"^[^\S\n]*Total samples[^\S\n]*:[^\S\n]*(\d+)", re.M)
+_ASYNC_BLOCK_RE = re.compile(r"^---[^\S\n]+.*,[^\S\n]*(\d+)[^\S\n]+samples", re.M)
+_ASYNC_FRAME_RE = re.compile(r"^[^\S\n]*\[[^\S\n]*\d+\][^\S\n]+(.+)", re.M)
+# A block's frames run until the next '---' line or the first blank line
+_ASYNC_BLOCK_END_RE = re.compile(r"^(?:---|[^\S\n]*$)", re.M)
 
 def parse_async_tree(path: str) -> Tuple[int, Dict[str, int]]:
     """
@@ -111,44 +120,27 @@ def parse_async_tree(path: str) -> Tuple[int, Dict[str, int]]:
       { method_key -> samples_accumulated_from_blocks_that_have_a_method }
     """
     with open(path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
+        text = f.read()
 
-    total_samples = 0
-    for line in lines:
-        m = _ASYNC_TOTAL_RE.match(line)
-        if m:
-            total_samples = int(m.group(1))
-            break
+    m = _ASYNC_TOTAL_RE.search(text)
+    total_samples = int(m.group(1)) if m else 0
 
     method_samples: Dict[str, int] = defaultdict(int)
 
-    i, n = 0, len(lines)
-    while i < n:
-        line = lines[i]
-        m = _ASYNC_BLOCK_RE.match(line)
-        if not m:
-            i += 1
-            continue
-
+    for m in _ASYNC_BLOCK_RE.finditer(text):
         block_samples = int(m.group(1))
-        i += 1
-
-        frames: List[str] = []
-        while i < n:
-            l2 = lines[i]
-            if l2.strip() == "" or l2.startswith("---"):
-                break
-            fm = _ASYNC_FRAME_RE.match(l2)
-            if fm:
-                frames.append(fm.group(1).strip())
-            i += 1
+
+        # Frames start on the line after the header
+        start = text.find("\n", m.end()) + 1 or len(text)
+        end_m = _ASYNC_BLOCK_END_RE.search(text, start)
+        end = end_m.start() if end_m else len(text)
+
+        frames = [s.strip() for s in _ASYNC_FRAME_RE.findall(text, start, end)]
 
         mk = pick_method_from_stack(frames)  # frames are already top->bottom from the async dump
         if mk is not None:
             method_samples[mk] += block_samples
 
-        # note: do not i += 1 here; we want to re-process next '---' if present
-
     return total_samples, dict(method_samples)
 
 
@@ -156,15 +148,52 @@ def parse_async_tree(path: str) -> Tuple[int, Dict[str, int]]:
 # JFR parsing via `jfr print --events jdk.ExecutionSample` (method-based)
 # ============================================================
 
-def jfr_print_exec_samples(jfr_bin: str, jfr_path: str) -> List[str]:
-    proc = subprocess.run(
+# `jfr print` stdout is consumed in chunks of this many characters
+JFR_READ_CHUNK = 1 << 20
+
+# One stackTrace block: frames run until a line starting with ']' (or, for a
+# truncated block, the next jdk.ExecutionSample header)
+_JFR_STACK_END = r"[^\S\n]*(?:\]|jdk\.ExecutionSample \{)"
+_JFR_STACK_RE = re.compile(
+    r"stackTrace = \[[^\n]*\n"
+    rf"((?:(?!{_JFR_STACK_END})[^\n]*\n)*)"
+    + _JFR_STACK_END
+)
+# A non-blank frame line, stripped and without its trailing comma(s)
+_JFR_FRAME_RE = re.compile(r"^[^\S\n]*([^\n]*[^\s,])", re.M)
+
+
+def _jfr_unterminated_frames(tail: str) -> List[str]:
+    """
+    Frames of a stackTrace block left open at the end of the output (no ']',
+    e.g. truncated `jfr print` output); [] if there is none.
+    """
+    start = tail.rfind("stackTrace = [")
+    if start < 0:
+        return []
+    nl = tail.find("\n", start)
+    return _JFR_FRAME_RE.findall(tail, nl + 1) if nl >= 0 else []
+
+
+def jfr_print_exec_samples(jfr_bin: str, jfr_path: str) -> Iterator[str]:
+    """
+    Stream `jfr print --events jdk.ExecutionSample <file>` stdout in
+    JFR_READ_CHUNK-sized pieces instead of buffering the whole dump. stderr
+    goes to a temp file so jfr can't stall on a full pipe while we are still
+    reading stdout.
+    """
+    with tempfile.TemporaryFile() as err, subprocess.Popen(
         [jfr_bin, "print", "--events", "jdk.ExecutionSample", jfr_path],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=err,
         text=True,
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(f"jfr print failed for {jfr_path}:\n{proc.stdout}\n{proc.stderr}")
-    return proc.stdout.splitlines()
+    ) as proc:
+        yield from iter(lambda: proc.stdout.read(JFR_READ_CHUNK), "")
+        if proc.wait() != 0:
+            err.seek(0)
+            raise RuntimeError(
+                f"jfr print failed for {jfr_path}:\n{err.read().decode(errors='replace')}"
+            )
 
 
 def parse_jfr_report(jfr_bin: str, jfr_path: str) -> Tuple[int, Dict[str, int]]:
@@ -175,47 +204,34 @@ def parse_jfr_report(jfr_bin: str, jfr_path: str) -> Tuple[int, Dict[str, int]]:
     if not os.path.isfile(jfr_path):
         raise FileNotFoundError(jfr_path)
 
-    lines = jfr_print_exec_samples(jfr_bin, jfr_path)
-
     total_samples = 0
     method_samples: Dict[str, int] = defaultdict(int)
 
-    in_stack = False
-    current_stack: List[str] = []
-
-    def flush_stack():
-        nonlocal total_samples, current_stack
-        if not current_stack:
-            return
-        mk = pick_method_from_stack(current_stack)  # current_stack is top->bottom from JFR text
+    # Complete stackTrace blocks are decoded straight out of the buffer;
+    # whatever follows the last one is kept for the next chunk
+    buf = ""
+    for chunk in jfr_print_exec_samples(jfr_bin, jfr_path):
+        buf += chunk
+        end = 0
+        for m in _JFR_STACK_RE.finditer(buf):
+            end = m.end()
+            frames = _JFR_FRAME_RE.findall(m.group(1))
+            if not frames:
+                continue
+            mk = pick_method_from_stack(frames)  # frames are top->bottom from JFR text
+            if mk is not None:
+                method_samples[mk] += 1
+                total_samples += 1
+        buf = buf[end:]
+
+    # A last block cut off before its ']' still counts as one sample
+    frames = _jfr_unterminated_frames(buf)
+    if frames:
+        mk = pick_method_from_stack(frames)
         if mk is not None:
             method_samples[mk] += 1
             total_samples += 1
-        current_stack = []
-
-    for line in lines:
-        s = line.strip()
-
-        if s.startswith("jdk.ExecutionSample {"):
-            flush_stack()
-            in_stack = False
-            continue
 
-        if "stackTrace = [" in s:
-            in_stack = True
-            current_stack = []
-            continue
-
-        if in_stack:
-            if s.startswith("]"):
-                flush_stack()
-                in_stack = False
-                continue
-            if s:
-                current_stack.append(s.rstrip(","))
-            continue
-
-    flush_stack()
     return total_samples, dict(method_samples)
 
 
@@ -227,6 +243,19 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+# CSV output is written through a buffer of this many bytes
+CSV_WRITE_BUFFER = 1 << 20
+
+
+def _write_csv(out_csv: str, header: List[str], rows: Iterable[tuple]) -> None:
+    # Shared by both emitters: each CSV goes out through one large buffer, and
+    # rows go to csv.writer as plain tuples (no per-row dict to unpack)
+    with open(out_csv, "w", newline="", buffering=CSV_WRITE_BUFFER) as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
 def write_counts_csv(
     out_csv: str,
     tool: str,
@@ -235,27 +264,18 @@ def write_counts_csv(
     total: int,
     counts: Dict[str, int],
 ) -> None:
-    ensure_dir(os.path.dirname(out_csv) or ".")
-    rows = []
-    for method_key, samples in sorted(counts.items()):
-        rows.append({
-            "tool": tool,
-            "benchmark": benchmark,
-            "run_type": run_type,
-            "method_key": method_key,
-            "samples": samples,
-            "total_samples": total,
-            "runtime_share_pct": (samples / total * 100.0) if total > 0 else 0.0,
-        })
-
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "tool", "benchmark", "run_type",
-            "method_key",
-            "samples", "total_samples", "runtime_share_pct",
-        ])
-        w.writeheader()
-        w.writerows(rows)
+    # samples / denom * scale is bit-identical to samples / total * 100.0 when
+    # total > 0 and gives 0.0 otherwise, so rows need no per-row branch
+    denom, scale = (total, 100.0) if total > 0 else (1, 0.0)
+    _write_csv(out_csv, [
+        "tool", "benchmark", "run_type",
+        "method_key",
+        "samples", "total_samples", "runtime_share_pct",
+    ], (
+        (tool, benchmark, run_type, method_key, samples, total,
+         samples / denom * scale)
+        for method_key, samples in sorted(counts.items(), key=itemgetter(0))
+    ))
 
 
 def write_slowdown_csv(
@@ -267,39 +287,66 @@ def write_slowdown_csv(
     slow_total: int,
     slow_counts: Dict[str, int],
 ) -> None:
-    ensure_dir(os.path.dirname(out_csv) or ".")
-    keys = sorted(set(base_counts.keys()) | set(slow_counts.keys()))
-    rows = []
-    for method_key in keys:
-        b = base_counts.get(method_key, 0)
-        s = slow_counts.get(method_key, 0)
-        if b == 0:
-            slowdown_pct = ""
-        else:
-            slowdown_pct = (s - b) / b * 100.0
-
-        rows.append({
-            "tool": tool,
-            "benchmark": benchmark,
-            "method_key": method_key,
-            "baseline_samples": b,
-            "slowdown_samples": s,
-            "slowdown_pct": slowdown_pct,
-            "runtime_share_pct_slow": (s / slow_total * 100.0) if slow_total > 0 else 0.0,
-            "total_samples_baseline": base_total,
-            "total_samples_slowdown": slow_total,
-        })
-
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "tool", "benchmark",
-            "method_key",
-            "baseline_samples", "slowdown_samples", "slowdown_pct",
-            "runtime_share_pct_slow",
-            "total_samples_baseline", "total_samples_slowdown",
-        ])
-        w.writeheader()
-        w.writerows(rows)
+    keys = sorted(base_counts.keys() | slow_counts.keys())
+    slow_denom, slow_scale = (slow_total, 100.0) if slow_total > 0 else (1, 0.0)
+
+    # Rows are generated while writing; no list of the whole table is built
+    def rows():
+        for method_key in keys:
+            b = base_counts.get(method_key, 0)
+            s = slow_counts.get(method_key, 0)
+            if b == 0:
+                slowdown_pct = ""
+            else:
+                slowdown_pct = (s - b) / b * 100.0
+
+            yield (
+                tool, benchmark, method_key, b, s, slowdown_pct,
+                s / slow_denom * slow_scale,
+                base_total, slow_total,
+            )
+
+    _write_csv(out_csv, [
+        "tool", "benchmark",
+        "method_key",
+        "baseline_samples", "slowdown_samples", "slowdown_pct",
+        "runtime_share_pct_slow",
+        "total_samples_baseline", "total_samples_slowdown",
+    ], rows())
+
+
+# ============================================================
+# Parse cache
+# ============================================================
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 2  # bump when a parser's return value changes
+
+
+def cached_parse(parse, path: str, cache_dir: str, *args):
+    """
+    Return parse(*args, path), memoized on disk under cache_dir.
+
+    Entries are keyed on (parser, path, mtime, size), so re-recording a run
+    invalidates its entry automatically.
+    """
+    st = os.stat(path)
+    key = (CACHE_VERSION, parse.__name__, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    cache_file = os.path.join(cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # truncated or unreadable entry; re-parse
+
+    result = parse(*args, path)
+    ensure_dir(cache_dir)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_file)
+    return result
 
 
 # ============================================================
@@ -307,17 +354,26 @@ def write_slowdown_csv(
 # ============================================================
 
 def find_benchmarks(base_dir: str) -> List[str]:
+    """
+    Benchmark folder names under base_dir, in inode order rather than by name:
+    on a cold cache that walks the inode table forwards instead of seeking
+    around it. Callers that print them sort the names themselves.
+    """
     if not os.path.isdir(base_dir):
         raise SystemExit(f"Base dir not found: {base_dir}")
-    bms = []
-    for d in sorted(os.listdir(base_dir)):
-        p = os.path.join(base_dir, d)
-        if os.path.isdir(p):
-            bms.append(d)
-    return bms
+    # DirEntry.is_dir() / inode() answer from the readdir entry where they can, no stat per entry
+    with os.scandir(base_dir) as it:
+        return [name for _, name in sorted((e.inode(), e.name) for e in it if e.is_dir())]
 
 
-def parse_one_benchmark(base_dir: str, out_dir: str, jfr_bin: str, benchmark: str) -> None:
+def parse_one_benchmark(
+    base_dir: str, out_dir: str, jfr_bin: str, benchmark: str, use_cache: bool = True,
+) -> List[str]:
+    """
+    Parse and write one benchmark's CSVs. Runs in a worker process, so status
+    lines are returned for main() to print rather than printed here.
+    """
+    log: List[str] = []
     bm_dir = os.path.join(base_dir, benchmark)
 
     # Expected names (matches your conventions)
@@ -326,59 +382,72 @@ def parse_one_benchmark(base_dir: str, out_dir: str, jfr_bin: str, benchmark: st
     jfr_no = os.path.join(bm_dir, f"{benchmark}_noSlow.jfr")
     jfr_sl = os.path.join(bm_dir, f"{benchmark}_slowdown.jfr")
 
+    # One stat per input; every guard below reuses these
+    have_async_no = os.path.isfile(async_no)
+    have_async_sl = os.path.isfile(async_sl)
+    have_jfr_no = os.path.isfile(jfr_no)
+    have_jfr_sl = os.path.isfile(jfr_sl)
+
+    cache_dir = os.path.join(out_dir, CACHE_DIR_NAME)
+
+    def parse(fn, path, *args):
+        return cached_parse(fn, path, cache_dir, *args) if use_cache else fn(*args, path)
+
+    # Start all four parses at once: both `jfr print` subprocesses run side by
+    # side and their pipe waits overlap with the async-tree parsing
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        async_no_f = ex.submit(parse, parse_async_tree, async_no) if have_async_no else None
+        async_sl_f = ex.submit(parse, parse_async_tree, async_sl) if have_async_sl else None
+        jfr_no_f = ex.submit(parse, parse_jfr_report, jfr_no, jfr_bin) if have_jfr_no else None
+        jfr_sl_f = ex.submit(parse, parse_jfr_report, jfr_sl, jfr_bin) if have_jfr_sl else None
+
     # --- Async ---
-    async_no_total, async_no_counts = (0, {})
-    async_sl_total, async_sl_counts = (0, {})
-    if os.path.isfile(async_no):
-        async_no_total, async_no_counts = parse_async_tree(async_no)
-    if os.path.isfile(async_sl):
-        async_sl_total, async_sl_counts = parse_async_tree(async_sl)
-
-    if os.path.isfile(async_no):
+    async_no_total, async_no_counts = async_no_f.result() if async_no_f else (0, {})
+    async_sl_total, async_sl_counts = async_sl_f.result() if async_sl_f else (0, {})
+
+    if have_async_no:
         out_csv = os.path.join(out_dir, "async_counts", f"{benchmark}_noSlow_async.csv")
         write_counts_csv(out_csv, "async", benchmark, "noSlow", async_no_total, async_no_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing async noSlow file: {async_no}")
+        log.append(f"[WARN] {benchmark}: missing async noSlow file: {async_no}")
 
-    if os.path.isfile(async_sl):
+    if have_async_sl:
         out_csv = os.path.join(out_dir, "async_counts", f"{benchmark}_slowdown_async.csv")
         write_counts_csv(out_csv, "async", benchmark, "slowdown", async_sl_total, async_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing async slowdown file: {async_sl}")
+        log.append(f"[WARN] {benchmark}: missing async slowdown file: {async_sl}")
 
-    if os.path.isfile(async_no) and os.path.isfile(async_sl):
+    if have_async_no and have_async_sl:
         out_csv = os.path.join(out_dir, "async_slowdown", f"{benchmark}_async_slowdown.csv")
         write_slowdown_csv(out_csv, "async", benchmark, async_no_total, async_no_counts, async_sl_total, async_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
 
     # --- JFR ---
-    jfr_no_total, jfr_no_counts = (0, {})
-    jfr_sl_total, jfr_sl_counts = (0, {})
-    if os.path.isfile(jfr_no):
-        jfr_no_total, jfr_no_counts = parse_jfr_report(jfr_bin, jfr_no)
-    if os.path.isfile(jfr_sl):
-        jfr_sl_total, jfr_sl_counts = parse_jfr_report(jfr_bin, jfr_sl)
-
-    if os.path.isfile(jfr_no):
+    jfr_no_total, jfr_no_counts = jfr_no_f.result() if jfr_no_f else (0, {})
+    jfr_sl_total, jfr_sl_counts = jfr_sl_f.result() if jfr_sl_f else (0, {})
+
+    if have_jfr_no:
         out_csv = os.path.join(out_dir, "jfr_counts", f"{benchmark}_noSlow_jfr.csv")
         write_counts_csv(out_csv, "jfr", benchmark, "noSlow", jfr_no_total, jfr_no_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing JFR noSlow file: {jfr_no}")
+        log.append(f"[WARN] {benchmark}: missing JFR noSlow file: {jfr_no}")
 
-    if os.path.isfile(jfr_sl):
+    if have_jfr_sl:
         out_csv = os.path.join(out_dir, "jfr_counts", f"{benchmark}_slowdown_jfr.csv")
         write_counts_csv(out_csv, "jfr", benchmark, "slowdown", jfr_sl_total, jfr_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing JFR slowdown file: {jfr_sl}")
+        log.append(f"[WARN] {benchmark}: missing JFR slowdown file: {jfr_sl}")
 
-    if os.path.isfile(jfr_no) and os.path.isfile(jfr_sl):
+    if have_jfr_no and have_jfr_sl:
         out_csv = os.path.join(out_dir, "jfr_slowdown", f"{benchmark}_jfr_slowdown.csv")
         write_slowdown_csv(out_csv, "jfr", benchmark, jfr_no_total, jfr_no_counts, jfr_sl_total, jfr_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
+
+    return log
 
 
 def main():
@@ -388,6 +457,10 @@ def main():
     ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Where to write CSVs.")
     ap.add_argument("--jfr-bin", default=DEFAULT_JFR_BIN, help="Path/name of the 'jfr' tool.")
     ap.add_argument("--benchmark", default=None, help="If set, only parse this benchmark folder name.")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                    help="Worker processes; benchmarks are parsed in parallel (default: CPU count).")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Re-parse every input instead of reusing <out-dir>/{CACHE_DIR_NAME}.")
     args = ap.parse_args()
 
     if args.benchmark:
@@ -397,10 +470,23 @@ def main():
 
     print("[INFO] base-dir:", args.base_dir)
     print("[INFO] out-dir :", args.out_dir)
-    print("[INFO] benchmarks:", ", ".join(benchmarks) if benchmarks else "<none>")
-
-    for bm in benchmarks:
-        parse_one_benchmark(args.base_dir, args.out_dir, args.jfr_bin, bm)
+    print("[INFO] benchmarks:", ", ".join(sorted(benchmarks)) if benchmarks else "<none>")
+
+    # Every CSV lands in one of these; create them here once rather than per file
+    for sub in ("async_counts", "async_slowdown", "jfr_counts", "jfr_slowdown"):
+        ensure_dir(os.path.join(args.out_dir, sub))
+
+    # Each benchmark's async dumps / jfr recordings are independent, so give
+    # every benchmark its own worker. Logs come back per benchmark and are
+    # printed here by name, so output never interleaves across workers and
+    # does not depend on the on-disk traversal order.
+    parse_bm = partial(parse_one_benchmark, args.base_dir, args.out_dir, args.jfr_bin,
+                       use_cache=not args.no_cache)
+    with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+        logs = dict(zip(benchmarks, ex.map(parse_bm, benchmarks)))
+    for benchmark in sorted(logs):
+        for line in logs[benchmark]:
+            print(line)
 
 
 if __name__ == "__main__":
@@ -25,145 +25,188 @@ Features:
       line 2: "C<comp>-L<loop>"
 """
 
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+import argparse
+import hashlib
+import os
+import pickle
 import re
 import csv
 
+import matplotlib
+matplotlib.use("Agg")  # headless and safe to use from worker processes
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 # -----------------------------------------------------------------------------
 # Bubo parsing – inclusive loops + parents + LoopCallCount
 # -----------------------------------------------------------------------------
 
-TOTAL_RUNTIME_RE = re.compile(r"Total Runtime:\s+(\d+)us")
-COMP_RE = re.compile(r"^Comp\s+(\d+)\s+\((.+?)\)\s+loops:")
-LOOP_RE = re.compile(r"loop\s+(\d+)\s+Cycles:\s+(\d+)")
-LOOP_CALL_RE = re.compile(r"LoopCallCount:\s*(\d+)")
-ENCODING_RE = re.compile(r"Found Encoding\s*:\s*(.*)")
+# One alternation over the whole file instead of several regexes per line.
+# Each branch consumes the rest of its line; [^\S\n] (whitespace other than a
+# newline) keeps matches from running into the next line. All patterns are
+# ASCII and run on the raw bytes, so the file is never decoded as a whole.
+BUBO_RE = re.compile(
+    rb"""
+      (?P<comp>^Comp[^\S\n]+(?P<comp_id>\d+)[^\S\n]+\((?P<method>.+?)\)[^\S\n]+loops:[^\n]*)
+    | (?P<loop>loop[^\S\n]+(?P<loop_id>\d+)[^\S\n]+Cycles:[^\S\n]+(?P<cycles>\d+)
+               (?:[^\n]*?LoopCallCount:[^\S\n]*(?P<calls>\d+))?[^\n]*)
+    | (?P<total>Total\ Runtime:[^\S\n]+(?P<total_us>\d+)us[^\n]*)
+    | (?P<average>average:[^\S\n]+(?P<avg_us>\d+)us[^\S\n]+total:[^\S\n]+\d+us[^\n]*)
+    | (?P<encoding>Found\ Encoding[^\S\n]*:[^\S\n]*(?P<enc>[^\n]*))
+    | (?P<blank>^[^\S\n]*$)
+    """,
+    re.M | re.X,
+)
 
 HARNESS_AVG_RE = re.compile(
-    r"average:\s+(\d+)us\s+total:\s+(\d+)us"
+    rb"average:\s+(\d+)us\s+total:\s+(\d+)us"
 )
 
 
+def build_children_csr(parent_idx):
+    """
+    CSR children layout (child_offsets, child_indices) from an array of
+    parent indices, -1 marking loops without a parent.
+    """
+    has_parent = parent_idx >= 0
+    parents_only = parent_idx[has_parent]
+    counts = np.bincount(parents_only, minlength=len(parent_idx))
+    child_offsets = np.zeros(len(parent_idx) + 1, dtype=np.int64)
+    np.cumsum(counts, out=child_offsets[1:])
+    order = np.argsort(parents_only, kind="stable")
+    child_indices = np.flatnonzero(has_parent)[order].astype(np.int64)
+    return child_offsets, child_indices
+
+
 def parse_bubo_file(path):
     """
     Parse <Bench>_LIR_false.out-like file (or LIR_true.out).
 
     Returns:
       total_runtime_us: int or None
-      loops:        dict[(comp_id, method_name, loop_id)] = inclusive_cycles
-      parents:      dict[(comp_id, loop_id)] = parent_loop_id or None
-      loop_calls:   dict[(comp_id, loop_id)] = LoopCallCount (int)
+      average_us:       harness 'average: XXXus' of the last such line, or None
+      loops: dict[comp_id] -> dict[loop_id] ->
+             (method_name, inclusive_cycles, LoopCallCount, parent_loop_id or None)
+      csr:   (cycles, child_offsets, child_indices) int64 arrays over all loops,
+             flattened in the iteration order of loops (comp by comp)
     """
     total_runtime = None
-    loops = {}
-    parents = {}
-    loop_calls = {}
+    average = None
+    loops = defaultdict(dict)
+    parents = defaultdict(dict)
 
     current_comp_id = None
     current_method = None
 
-    with path.open(encoding="utf-8", errors="replace") as f:
-        for line in f:
-            line = line.rstrip("\n")
-
-            m = TOTAL_RUNTIME_RE.search(line)
-            if m:
-                try:
-                    total_runtime = int(m.group(1))
-                except ValueError:
-                    pass
-                continue
-
-            m = COMP_RE.match(line)
-            if m:
-                current_comp_id = int(m.group(1))
-                current_method = m.group(2).strip()
-                continue
+    data = path.read_bytes()
 
-            m = ENCODING_RE.search(line)
-            if m and current_comp_id is not None:
-                enc_str = m.group(1).strip()
-                if enc_str:
-                    parts = enc_str.split(",")
-                    for p in parts:
-                        p = p.strip()
-                        if not p or ":" not in p:
-                            continue
-                        lid_str, pid_str = p.split(":", 1)
-                        try:
-                            lid = int(lid_str)
-                            pid = int(pid_str)
-                        except ValueError:
-                            continue
-                        parent = None if pid < 0 else pid
-                        parents[(current_comp_id, lid)] = parent
-                continue
+    for m in BUBO_RE.finditer(data):
+        kind = m.lastgroup
 
+        if kind == "loop":
             if current_comp_id is not None:
-                m = LOOP_RE.search(line)
-                if m:
-                    loop_id = int(m.group(1))
-                    cycles = int(m.group(2))
-
-                    # LoopCallCount is on the same line
-                    call_match = LOOP_CALL_RE.search(line)
-                    if call_match:
-                        try:
-                            call_count = int(call_match.group(1))
-                        except ValueError:
-                            call_count = 0
-                    else:
-                        call_count = 0
-
-                    loops[(current_comp_id, current_method, loop_id)] = cycles
-                    loop_calls[(current_comp_id, loop_id)] = call_count
-                    continue
+                call_count = int(m.group("calls")) if m.group("calls") else 0
+                loops[current_comp_id][int(m.group("loop_id"))] = (
+                    current_method, int(m.group("cycles")), call_count
+                )
 
-            if not line.strip():
-                current_comp_id = None
-                current_method = None
+        elif kind == "comp":
+            current_comp_id = int(m.group("comp_id"))
+            current_method = m.group("method").strip().decode("utf-8", errors="replace")
 
-    return total_runtime, loops, parents, loop_calls
+        elif kind == "encoding":
+            if current_comp_id is None:
+                continue
+            enc_str = m.group("enc").strip()
+            if enc_str:
+                parts = enc_str.split(b",")
+                for p in parts:
+                    p = p.strip()
+                    if not p or b":" not in p:
+                        continue
+                    lid_str, pid_str = p.split(b":", 1)
+                    try:
+                        lid = int(lid_str)
+                        pid = int(pid_str)
+                    except ValueError:
+                        continue
+                    parent = None if pid < 0 else pid
+                    parents[current_comp_id][lid] = parent
+
+        elif kind == "total":
+            total_runtime = int(m.group("total_us"))
+
+        elif kind == "average":
+            average = int(m.group("avg_us"))  # last match wins
+
+        else:  # blank line ends the current comp block
+            current_comp_id = None
+            current_method = None
+
+    # The encoding line may come before or after the loop lines, so parents
+    # are attached once the whole file has been read. The same pass flattens
+    # the loops into one index space and records each loop's parent index,
+    # from which the children CSR used by compute_exclusive_cycles is built.
+    flat_cycles = []
+    parent_idx = []
+    for comp_id, comp_loops in loops.items():
+        comp_parents = parents.get(comp_id, {})
+        base = len(flat_cycles)
+        pos = {loop_id: base + k for k, loop_id in enumerate(comp_loops)}
+        for loop_id, (method, cycles, call_count) in comp_loops.items():
+            parent = comp_parents.get(loop_id)
+            comp_loops[loop_id] = (method, cycles, call_count, parent)
+            flat_cycles.append(cycles)
+            parent_idx.append(pos.get(parent, -1))
+
+    child_offsets, child_indices = build_children_csr(np.array(parent_idx, dtype=np.int64))
+    csr = (np.array(flat_cycles, dtype=np.int64), child_offsets, child_indices)
+
+    return total_runtime, average, dict(loops), csr
+
+
+def _exclusive(cycles, child_offsets, child_indices):
+    """
+    excl[i] = max(0, cycles[i] - sum of cycles over the children of i),
+    with the children of i at child_indices[child_offsets[i]:child_offsets[i + 1]].
+    """
+    # Per-parent child sums as differences of one running int64 sum over the
+    # CSR children, so empty child ranges come out as 0 and nothing is rounded
+    run = np.zeros(len(child_indices) + 1, dtype=np.int64)
+    np.cumsum(cycles[child_indices], out=run[1:])
+    child_sums = run[child_offsets[1:]] - run[child_offsets[:-1]]
+    return np.maximum(cycles - child_sums, 0)
 
 
-def compute_exclusive_cycles(loops, parents):
+def compute_exclusive_cycles(loops, csr):
     """
-    Given:
-      loops:   dict[(comp_id, method, loop_id)] = inclusive_cycles
-      parents: dict[(comp_id, loop_id)] = parent_loop_id or None
+    Given (both as returned by parse_bubo_file):
+      loops: dict[comp_id] -> dict[loop_id] -> (method, inclusive_cycles, call_count, parent)
+      csr:   (cycles, child_offsets, child_indices) flattened over loops
 
     Return:
-      exclusive: dict[(comp_id, method, loop_id)] = exclusive_cycles
+      exclusive: dict[comp_id] -> dict[loop_id] -> (method, exclusive_cycles)
     """
-    key_by_id = {}
-    for (comp_id, method, loop_id) in loops.keys():
-        key_by_id[(comp_id, loop_id)] = (comp_id, method, loop_id)
-
-    children = {}
-    for (comp_id, loop_id), parent in parents.items():
-        if parent is None:
-            continue
-        children.setdefault((comp_id, parent), []).append(loop_id)
+    excl = _exclusive(*csr).tolist()
 
     exclusive = {}
+    i = 0
+    for comp_id, comp_loops in loops.items():
+        comp_excl = {}
+        for loop_id, (method, _, _, _) in comp_loops.items():
+            comp_excl[loop_id] = (method, excl[i])
+            i += 1
+        exclusive[comp_id] = comp_excl
 
-    for (comp_id, method, loop_id), inclusive in loops.items():
-        child_ids = children.get((comp_id, loop_id), [])
-        child_sum = 0
-        for cid in child_ids:
-            child_key = key_by_id.get((comp_id, cid))
-            if child_key is not None:
-                child_sum += loops.get(child_key, 0)
+    return exclusive
 
-        excl = inclusive - child_sum
-        if excl < 0:
-            excl = 0
-        exclusive[(comp_id, method, loop_id)] = excl
 
-    return exclusive
+HARNESS_TAIL_BYTES = 64 * 1024
 
 
 def extract_average_runtime_us(path: Path):
@@ -171,31 +214,38 @@ def extract_average_runtime_us(path: Path):
     From a *.out file, find the last line containing
       'average: XXXus total: YYYus'
     and return XXX as int, or None if not found.
+
+    Only the tail of the file is read; the window doubles until a match is
+    found or the whole file has been scanned.
     """
-    avg = None
-    with path.open(encoding="utf-8", errors="replace") as f:
-        for line in f:
-            m = HARNESS_AVG_RE.search(line)
-            if m:
-                try:
-                    avg = int(m.group(1))
-                except ValueError:
-                    continue
-    return avg
+    with path.open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        window = HARNESS_TAIL_BYTES
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            tail = f.read()
+            matches = HARNESS_AVG_RE.findall(tail)
+            if matches:
+                return int(matches[-1][0])
+            if start == 0:
+                return None
+            window *= 2
 
 
 # -----------------------------------------------------------------------------
 # Async parsing – using marker layout
 # -----------------------------------------------------------------------------
 
-TOTAL_SAMPLES_RE = re.compile(r"^Total samples\s*:\s*(\d+)")
+# Async dumps are also matched as bytes; only ints are ever extracted.
+TOTAL_SAMPLES_RE = re.compile(rb"^Total samples\s*:\s*(\d+)")
 BLOCK_HEADER_RE = re.compile(
-    r"^---\s+(\d+)\s+ns\s+\(([0-9.]+)%\),\s+(\d+)\s+samples"
+    rb"^---\s+(\d+)\s+ns\s+\(([0-9.]+)%\),\s+(\d+)\s+samples"
 )
-FRAME_RE = re.compile(r"^\s*\[\s*\d+\s*\]\s+(.*)$")
+FRAME_RE = re.compile(rb"^\s*\[\s*\d+\s*\]\s+(.*)$")
 
-MARKER_DELIM = "BuboAgentCompilerMarkers.MarkerDelimiter"
-MARKER_RE = re.compile(r"BuboAgentCompilerMarkers\.Marker(\d+)\b")
+MARKER_DELIM = b"BuboAgentCompilerMarkers.MarkerDelimiter"
+MARKER_RE = re.compile(rb"BuboAgentCompilerMarkers\.Marker(\d+)\b")
 
 
 def parse_total_samples(lines):
@@ -219,12 +269,12 @@ def iter_blocks(lines):
             i += 1
             continue
 
-        header = lines[i].rstrip("\n")
+        header = lines[i]
         i += 1
         frames = []
-        while i < n and not lines[i].startswith("--- "):
+        while i < n and not lines[i].startswith(b"--- "):
             if FRAME_RE.match(lines[i]):
-                frames.append(lines[i].rstrip("\n"))
+                frames.append(lines[i])
             i += 1
 
         yield header, frames
@@ -247,39 +297,43 @@ def extract_marker_ids(frame_lines):
 
     - Loop ID = marker immediately BEFORE the delimiter.
     - Comp ID digits = markers AFTER delimiter, concatenated and reversed.
-    """
-    funcs = []
-    for fl in frame_lines:
-        m = FRAME_RE.match(fl)
-        if m:
-            funcs.append(m.group(1))
 
-    try:
-        d = funcs.index(MARKER_DELIM)
-    except ValueError:
+    Single pass over the frames: remember the previous frame until the
+    delimiter shows up, then collect marker digits until the first
+    non-marker frame.
+    """
+    # Fast path for the common case of a stack without any marker frames:
+    # one C-level join + substring search instead of a per-frame loop.
+    if MARKER_DELIM not in b"\n".join(frame_lines):
         return None
 
-    # loop id = marker before delimiter
+    prev = None
     loop_id = None
-    if d > 0:
-        b = funcs[d - 1]
-        mb = MARKER_RE.search(b)
-        if mb:
-            loop_id = int(mb.group(1))
-    if loop_id is None:
-        return None
+    digits = None  # None until the delimiter has been seen
 
-    # comp id digits = markers after delimiter
-    digits = []
-    for f in funcs[d + 1:]:
-        mm = MARKER_RE.search(f)
+    for fl in frame_lines:
+        if digits is None:
+            if MARKER_DELIM in fl and (m := FRAME_RE.match(fl)) and m.group(1) == MARKER_DELIM:
+                # loop id = marker before delimiter
+                mb = MARKER_RE.search(prev) if prev is not None else None
+                if not mb:
+                    return None
+                loop_id = int(mb.group(1))
+                digits = []
+            else:
+                prev = fl
+            continue
+
+        # comp id digits = markers after delimiter
+        mm = MARKER_RE.search(fl)
         if not mm:
             break
         digits.append(mm.group(1))
+
     if not digits:
         return None
 
-    comp_id = int("".join(reversed(digits)))
+    comp_id = int(b"".join(reversed(digits)))
     return (comp_id, loop_id)
 
 
@@ -291,33 +345,97 @@ def parse_async_marker_file(path):
       total_samples: int or None
       results: dict[(comp_id, loop_id)] = samples
     """
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    lines = path.read_bytes().splitlines()
 
     total = parse_total_samples(lines)
-    results = {}
+    results = defaultdict(int)
 
     for hdr, frames in iter_blocks(lines):
-        block_samples = parse_block_samples(hdr)
         ids = extract_marker_ids(frames)
         if ids is None:
             continue
-        results[ids] = results.get(ids, 0) + block_samples
+        results[ids] += parse_block_samples(hdr)
+
+    return total, dict(results)
+
 
-    return total, results
+# -----------------------------------------------------------------------------
+# Parse cache
+# -----------------------------------------------------------------------------
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 3  # bump when a parser's return value changes
+
+
+def cached_parse(parse, path: Path, cache_dir: Path):
+    """
+    Return parse(path), memoized on disk under cache_dir.
+
+    Entries are keyed on (parser, path, mtime, size), so editing or replacing
+    an input file invalidates its entry automatically.
+    """
+    st = path.stat()
+    key = (CACHE_VERSION, parse.__name__, str(path.resolve()), st.st_mtime_ns, st.st_size)
+    cache_file = cache_dir / (hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+    if cache_file.exists():
+        try:
+            return pickle.loads(cache_file.read_bytes())
+        except Exception:
+            pass  # truncated or stale entry; re-parse
+
+    result = parse(path)
+    cache_dir.mkdir(exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp, cache_file)
+    return result
 
 
 # -----------------------------------------------------------------------------
 # Plotting + CSV
 # -----------------------------------------------------------------------------
 
+CSV_FIELDS = (
+    "CompId",
+    "LoopId",
+    "Method",
+    "BuboExclusiveCyclesBaseline",
+    "BuboExclusiveCyclesSlowdown",
+    "AsyncSamplesBaseline",
+    "AsyncSamplesSlowdown",
+    "BuboPercentChange",
+    "AsyncPercentChange",
+    "BuboSlowdownSharePercent",
+    "AsyncSlowdownSharePercent",
+    "BaselineAvgUs",
+    "SlowdownAvgUs",
+    "OverheadPercent",
+)
+
 MAX_LOOPS = 40
 COVERAGE_THRESHOLD = 99.0  # percent of total baseline Bubo (for selection only)
 
+# One Figure/Axes per process, cleared and resized for each benchmark instead
+# of building (and tearing down) a new figure every time.
+_FIG = None
+_AX = None
+
+
+def get_plot_axes(width, height):
+    global _FIG, _AX
+    if _FIG is None:
+        _FIG, _AX = plt.subplots(figsize=(width, height))
+    else:
+        _FIG.set_size_inches(width, height)
+        _AX.clear()
+    return _FIG, _AX
+
 
 def create_benchmark_plot(
     bench_name,
     rows,
     out_png: Path,
+    log,
     overhead_percent=None,
 ):
     """
@@ -328,9 +446,11 @@ def create_benchmark_plot(
       BuboSlowdownSharePercent,
       AsyncSlowdownSharePercent,
       OverheadPercent
+
+    Status lines are appended to log rather than printed.
     """
     if not rows:
-        print(f"  [WARN] No loops to plot for {bench_name}")
+        log.append(f"  [WARN] No loops to plot for {bench_name}")
         return
 
     k = len(rows)
@@ -341,7 +461,7 @@ def create_benchmark_plot(
     async_changes = [r["AsyncPercentChange"] for r in rows]
 
     fig_width = max(10, k * 0.6)
-    fig, ax = plt.subplots(figsize=(fig_width, 6))
+    fig, ax = get_plot_axes(fig_width, 6)
 
     x_bubo = [i - width / 2 for i in x]
     x_async = [i + width / 2 for i in x]
@@ -398,18 +518,37 @@ def create_benchmark_plot(
     ax.legend()
     fig.tight_layout()
     fig.savefig(out_png, dpi=200)
-    plt.close(fig)
+    ax.clear()
 
-    print(f"  -> wrote plot: {out_png.name}")
+    log.append(f"  -> wrote plot: {out_png.name}")
 
 
 # -----------------------------------------------------------------------------
 # Per-benchmark compare
 # -----------------------------------------------------------------------------
 
-def analyze_benchmark(bench_dir: Path, root_out: Path):
+def percent_change(slow, base):
+    """(slow - base) / base * 100 element-wise, 0.0 where base == 0."""
+    out = np.zeros(len(base), dtype=np.float64)
+    np.divide(slow - base, base, out=out, where=base > 0)
+    return out * 100.0
+
+
+def percent_share(values, total):
+    """values / total * 100, or all zeros when total is not positive."""
+    if total > 0:
+        return values / float(total) * 100.0
+    return np.zeros(len(values), dtype=np.float64)
+
+
+def analyze_benchmark(bench_dir: Path, root_out: Path, use_cache: bool = True):
+    """
+    Compare one benchmark and write its CSV/PNG. Runs in a worker process, so
+    status lines are returned for main() to print rather than printed here.
+    """
+    log = []
     bench_name = bench_dir.name
-    print(f"[INFO] Benchmark: {bench_name}")
+    log.append(f"[INFO] Benchmark: {bench_name}")
 
     # File names
     bubo_baseline_path = bench_dir / f"{bench_name}_LIR_false.out"
@@ -419,32 +558,41 @@ def analyze_benchmark(bench_dir: Path, root_out: Path):
 
     # Check presence
     if not bubo_baseline_path.exists():
-        print(f"  [WARN] Missing {bubo_baseline_path.name}, skipping.")
-        return
+        log.append(f"  [WARN] Missing {bubo_baseline_path.name}, skipping.")
+        return log
     if not async_baseline_path.exists():
-        print(f"  [WARN] Missing {async_baseline_path.name}, skipping.")
-        return
+        log.append(f"  [WARN] Missing {async_baseline_path.name}, skipping.")
+        return log
     if not bubo_slowdown_path.exists():
-        print(f"  [WARN] Missing {bubo_slowdown_path.name}, slowdown Bubo data will be zero.")
+        log.append(f"  [WARN] Missing {bubo_slowdown_path.name}, slowdown Bubo data will be zero.")
     if not async_slowdown_path.exists():
-        print(f"  [WARN] Missing {async_slowdown_path.name}, slowdown Async data will be zero.")
+        log.append(f"  [WARN] Missing {async_slowdown_path.name}, slowdown Async data will be zero.")
 
     # -------------------------------------------------------------------------
     # 1) Overall runtime overhead from harness averages (baseline vs slowdown)
     # -------------------------------------------------------------------------
-    baseline_avg = extract_average_runtime_us(bubo_baseline_path)
-    slowdown_avg = extract_average_runtime_us(bubo_slowdown_path) if bubo_slowdown_path.exists() else None
+    cache_dir = root_out / CACHE_DIR_NAME
+
+    def parse(fn, path):
+        return cached_parse(fn, path, cache_dir) if use_cache else fn(path)
+
+    # Each Bubo dump is read once; the harness average comes from the same parse.
+    _, baseline_avg, loops_base, csr_base = parse(parse_bubo_file, bubo_baseline_path)
+    if bubo_slowdown_path.exists():
+        _, slowdown_avg, loops_slow, csr_slow = parse(parse_bubo_file, bubo_slowdown_path)
+    else:
+        slowdown_avg, loops_slow, csr_slow = None, None, None
 
     overhead_percent = None
     if baseline_avg is not None and slowdown_avg is not None and baseline_avg > 0:
         overhead_percent = (slowdown_avg - baseline_avg) / float(baseline_avg) * 100.0
-        print(
+        log.append(
             f"  [INFO] Runtime averages (us): "
             f"baseline={baseline_avg}, slowdown={slowdown_avg}, "
             f"overhead={overhead_percent:+.2f}%"
         )
     else:
-        print("  [WARN] Could not compute overhead (missing or invalid averages).")
+        log.append("  [WARN] Could not compute overhead (missing or invalid averages).")
 
     # -------------------------------------------------------------------------
     # 2) Bubo vs Async per (CompId, LoopId)
@@ -452,44 +600,43 @@ def analyze_benchmark(bench_dir: Path, root_out: Path):
     # -------------------------------------------------------------------------
 
     # Bubo baseline
-    _, loops_base, parents_base, loop_calls_base = parse_bubo_file(bubo_baseline_path)
-    exclusive_base = compute_exclusive_cycles(loops_base, parents_base)
+    exclusive_base = compute_exclusive_cycles(loops_base, csr_base)
 
     # Keep only loops with LoopCallCount == 0 in the baseline
     bubo_baseline_map = {}
-    for (comp_id, method, loop_id), cycles in exclusive_base.items():
-        call_count = loop_calls_base.get((comp_id, loop_id), None)
-        # If LoopCallCount is missing, drop it
-        if call_count == 0:
-            bubo_baseline_map[(comp_id, loop_id)] = (method, cycles)
+    for comp_id, comp_excl in exclusive_base.items():
+        comp_loops = loops_base[comp_id]
+        for loop_id, (method, cycles) in comp_excl.items():
+            if comp_loops[loop_id][2] == 0:
+                bubo_baseline_map[(comp_id, loop_id)] = (method, cycles)
 
     if not bubo_baseline_map:
-        print("  [WARN] No baseline Bubo loops with LoopCallCount == 0, skipping.")
-        return
+        log.append("  [WARN] No baseline Bubo loops with LoopCallCount == 0, skipping.")
+        return log
 
     # Bubo slowdown
     bubo_slow_map = {}
-    if bubo_slowdown_path.exists():
-        _, loops_slow, parents_slow, _ = parse_bubo_file(bubo_slowdown_path)
-        exclusive_slow = compute_exclusive_cycles(loops_slow, parents_slow)
-        for (comp_id, method, loop_id), cycles in exclusive_slow.items():
-            if (comp_id, loop_id) in bubo_baseline_map:
-                base_method, _ = bubo_baseline_map[(comp_id, loop_id)]
-                bubo_slow_map[(comp_id, loop_id)] = (base_method, cycles)
+    if loops_slow is not None:
+        exclusive_slow = compute_exclusive_cycles(loops_slow, csr_slow)
+        # Walk the (smaller) selected baseline set and probe the slow results
+        for (comp_id, loop_id), (base_method, _) in bubo_baseline_map.items():
+            slow = exclusive_slow.get(comp_id, {}).get(loop_id)
+            if slow is not None:
+                bubo_slow_map[(comp_id, loop_id)] = (base_method, slow[1])
 
     # Async baseline
-    async_total_base, async_baseline_map = parse_async_marker_file(async_baseline_path)
+    async_total_base, async_baseline_map = parse(parse_async_marker_file, async_baseline_path)
 
     # Async slowdown
     async_slow_map = {}
     if async_slowdown_path.exists():
-        async_total_slow, async_slow_map = parse_async_marker_file(async_slowdown_path)
+        async_total_slow, async_slow_map = parse(parse_async_marker_file, async_slowdown_path)
     else:
         async_total_slow = None
 
     if not async_baseline_map:
-        print("  [WARN] No async baseline samples found, skipping.")
-        return
+        log.append("  [WARN] No async baseline samples found, skipping.")
+        return log
 
     # Common keys: loops that both tools see in the baseline,
     # and that have LoopCallCount == 0 (via bubo_baseline_map)
@@ -500,119 +647,91 @@ def analyze_benchmark(bench_dir: Path, root_out: Path):
     )
 
     if not common_keys:
-        print("  [WARN] No common (CompId, LoopId) between Bubo (LoopCallCount==0) and Async baseline.")
-        return
+        log.append("  [WARN] No common (CompId, LoopId) between Bubo (LoopCallCount==0) and Async baseline.")
+        return log
+
+    # Per-key raw values as parallel arrays; missing slowdown data -> 0
+    b_base = np.array([bubo_baseline_map[k][1] for k in common_keys], dtype=np.int64)
+    b_slow = np.array([bubo_slow_map.get(k, (None, 0))[1] for k in common_keys], dtype=np.int64)
+    a_base = np.array([async_baseline_map[k] for k in common_keys], dtype=np.int64)
+    a_slow = np.array([async_slow_map.get(k, 0) for k in common_keys], dtype=np.int64)
 
     # Totals restricted to common keys:
     # - total baseline Bubo: for coverage selection
     # - total slowdown Bubo/Async: for slowdown shares used in labels
-    total_bubo_base = sum(bubo_baseline_map[k][1] for k in common_keys)
+    total_bubo_base = int(b_base.sum())
     if total_bubo_base == 0:
-        print("  [WARN] Zero total baseline Bubo, skipping.")
-        return
-
-    total_bubo_slow_all = sum(bubo_slow_map.get(k, (None, 0))[1] for k in common_keys)
-    total_async_slow_all = sum(async_slow_map.get(k, 0) for k in common_keys)
-
-    selected_rows = []
-    coverage = 0.0
-
-    for i, (comp_id, loop_id) in enumerate(common_keys):
-        if i >= MAX_LOOPS:
-            break
-
-        method, b_cycles_base = bubo_baseline_map[(comp_id, loop_id)]
-
-        # Bubo slowdown (may be missing -> 0)
-        _, b_cycles_slow = bubo_slow_map.get((comp_id, loop_id), (method, 0))
-
-        # Async baseline
-        a_samples_base = async_baseline_map[(comp_id, loop_id)]
-
-        # Async slowdown (may be missing -> 0)
-        a_samples_slow = async_slow_map.get((comp_id, loop_id), 0)
-
-        # Percent changes in raw units
-        if b_cycles_base > 0:
-            bubo_pct_change = (b_cycles_slow - b_cycles_base) / float(b_cycles_base) * 100.0
-        else:
-            bubo_pct_change = 0.0
-
-        if a_samples_base > 0:
-            async_pct_change = (a_samples_slow - a_samples_base) / float(a_samples_base) * 100.0
-        else:
-            async_pct_change = 0.0
-
-        # Slowdown shares (for labels)
-        if total_bubo_slow_all > 0:
-            b_slow_share = (b_cycles_slow / float(total_bubo_slow_all)) * 100.0
-        else:
-            b_slow_share = 0.0
-
-        if total_async_slow_all > 0:
-            a_slow_share = (a_samples_slow / float(total_async_slow_all)) * 100.0
-        else:
-            a_slow_share = 0.0
-
-        # For coverage selection, use baseline Bubo share
-        b_share_base = (b_cycles_base / float(total_bubo_base)) * 100.0
+        log.append("  [WARN] Zero total baseline Bubo, skipping.")
+        return log
+
+    total_bubo_slow_all = int(b_slow.sum())
+    total_async_slow_all = int(a_slow.sum())
+
+    # Percent changes in raw units
+    bubo_pct_change = percent_change(b_slow, b_base)
+    async_pct_change = percent_change(a_slow, a_base)
+
+    # Slowdown shares (for labels)
+    b_slow_share = percent_share(b_slow, total_bubo_slow_all)
+    a_slow_share = percent_share(a_slow, total_async_slow_all)
+
+    # For coverage selection, use baseline Bubo share: keep loops up to and
+    # including the one where cumulative coverage reaches the threshold.
+    coverage = np.cumsum(percent_share(b_base, total_bubo_base))
+    n_selected = min(
+        int(np.searchsorted(coverage, COVERAGE_THRESHOLD)) + 1,
+        len(common_keys),
+        MAX_LOOPS,
+    )
 
-        row = {
+    columns = zip(
+        common_keys[:n_selected],
+        b_base[:n_selected].tolist(),
+        b_slow[:n_selected].tolist(),
+        a_base[:n_selected].tolist(),
+        a_slow[:n_selected].tolist(),
+        bubo_pct_change[:n_selected].tolist(),
+        async_pct_change[:n_selected].tolist(),
+        b_slow_share[:n_selected].tolist(),
+        a_slow_share[:n_selected].tolist(),
+    )
+    selected_rows = [
+        {
             "CompId": comp_id,
             "LoopId": loop_id,
-            "Method": method,
-            "BuboExclusiveCyclesBaseline": b_cycles_base,
-            "BuboExclusiveCyclesSlowdown": b_cycles_slow,
-            "AsyncSamplesBaseline": a_samples_base,
-            "AsyncSamplesSlowdown": a_samples_slow,
-            "BuboPercentChange": bubo_pct_change,
-            "AsyncPercentChange": async_pct_change,
-            "BuboSlowdownSharePercent": b_slow_share,
-            "AsyncSlowdownSharePercent": a_slow_share,
+            "Method": bubo_baseline_map[(comp_id, loop_id)][0],
+            "BuboExclusiveCyclesBaseline": b_cyc_base,
+            "BuboExclusiveCyclesSlowdown": b_cyc_slow,
+            "AsyncSamplesBaseline": a_smp_base,
+            "AsyncSamplesSlowdown": a_smp_slow,
+            "BuboPercentChange": b_pct,
+            "AsyncPercentChange": a_pct,
+            "BuboSlowdownSharePercent": b_share,
+            "AsyncSlowdownSharePercent": a_share,
             "BaselineAvgUs": baseline_avg,
             "SlowdownAvgUs": slowdown_avg,
             "OverheadPercent": overhead_percent,
         }
-        selected_rows.append(row)
-
-        coverage += b_share_base
-        if coverage >= COVERAGE_THRESHOLD:
-            break
+        for ((comp_id, loop_id), b_cyc_base, b_cyc_slow, a_smp_base, a_smp_slow,
+             b_pct, a_pct, b_share, a_share) in columns
+    ]
 
     if not selected_rows:
-        print("  [WARN] No rows selected after filtering, skipping.")
-        return
+        log.append("  [WARN] No rows selected after filtering, skipping.")
+        return log
 
     # Write CSV and plot in root_out
     out_csv = root_out / f"{bench_name}_BuboAsync_CompLoopShares.csv"
     with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=[
-                "CompId",
-                "LoopId",
-                "Method",
-                "BuboExclusiveCyclesBaseline",
-                "BuboExclusiveCyclesSlowdown",
-                "AsyncSamplesBaseline",
-                "AsyncSamplesSlowdown",
-                "BuboPercentChange",
-                "AsyncPercentChange",
-                "BuboSlowdownSharePercent",
-                "AsyncSlowdownSharePercent",
-                "BaselineAvgUs",
-                "SlowdownAvgUs",
-                "OverheadPercent",
-            ],
-        )
-        w.writeheader()
-        for r in selected_rows:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(CSV_FIELDS)
+        w.writerows([tuple(r[k] for k in CSV_FIELDS) for r in selected_rows])
 
-    print(f"  -> wrote CSV: {out_csv.name}")
+    log.append(f"  -> wrote CSV: {out_csv.name}")
 
     out_png = root_out / f"{bench_name}_BuboAsync_CompLoopShares.png"
-    create_benchmark_plot(bench_name, selected_rows, out_png, overhead_percent=overhead_percent)
+    create_benchmark_plot(bench_name, selected_rows, out_png, log, overhead_percent=overhead_percent)
+    return log
 
 
 # -----------------------------------------------------------------------------
@@ -620,12 +739,36 @@ def analyze_benchmark(bench_dir: Path, root_out: Path):
 # -----------------------------------------------------------------------------
 
 def main():
+    ap = argparse.ArgumentParser(description="Bubo vs Async per (CompId, LoopId) comparison.")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-parse every input instead of reusing ./{CACHE_DIR_NAME}",
+    )
+    ap.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of benchmarks analysed in parallel (default: CPU count)",
+    )
+    args = ap.parse_args()
+
     root = Path(".").resolve()
     print("[INFO] ThirdTest_SimRuns root:", root)
 
-    for bench_dir in sorted(root.iterdir()):
-        if bench_dir.is_dir() and not bench_dir.name.startswith("."):
-            analyze_benchmark(bench_dir, root)
+    bench_dirs = [
+        d for d in sorted(root.iterdir())
+        if d.is_dir() and not d.name.startswith(".") and d.name != "__pycache__"
+    ]
+
+    # Benchmarks are independent and only write their own CSV/PNG. Logs come
+    # back in benchmark order and are printed here, so output never
+    # interleaves across workers.
+    analyze = partial(analyze_benchmark, root_out=root, use_cache=not args.no_cache)
+    with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+        for log in ex.map(analyze, bench_dirs):
+            for line in log:
+                print(line)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,20 @@ import os
 import csv
 import re
 import subprocess
+import tempfile
 from collections import defaultdict
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Iterator, Tuple, List, Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # fall back to plain Python if numba is not installed
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # --------------------------------------------------------------------
 # Config
@@ -42,8 +52,8 @@ def load_runtime_overheads(csv_path: str) -> Dict[str, float]:
     return overheads
 
 
-_marker_re = re.compile(r"BuboAgentCompilerMarkers\.Marker(\d+)")
-_delim_re = re.compile(r"BuboAgentCompilerMarkers\.MarkerDelimiter")
+# One scan per frame: either the delimiter or a digit marker
+_FRAME_RE = re.compile(r"BuboAgentCompilerMarkers\.(?:Marker(?P<d>\d+)|(?P<delim>MarkerDelimiter))")
 
 
 def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
@@ -54,50 +64,217 @@ def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
     IMPORTANT: markers BEFORE the delimiter encode the **loop_id**,
                markers AFTER the delimiter encode the **comp_id**.
     """
-    pre_digits: List[int] = []   # loop id
-    post_digits: List[int] = []  # comp id
+    # Marker digits are accumulated as running ints (Marker1, Marker2 -> 12)
+    loop_id = comp_id = 0
+    have_pre = have_post = False
     seen_delim = False
 
     for fn in frames:
-        if _delim_re.search(fn):
-            seen_delim = True
-            continue
-
-        m = _marker_re.search(fn)
+        m = _FRAME_RE.search(fn)
         if not m:
             # Once we've started seeing markers, stop when we hit non-marker.
-            if seen_delim or pre_digits:
+            if seen_delim or have_pre:
                 break
             else:
                 continue
 
-        digit = int(m.group(1))
+        if m.group("delim"):
+            seen_delim = True
+            continue
+
+        # shift by the digits of int(d), so zero-padded Marker007 appends "7"
+        d = int(m.group("d"))
+        shift = 10 ** len(str(d))
         if not seen_delim:
-            pre_digits.append(digit)
+            loop_id = loop_id * shift + d
+            have_pre = True
         else:
-            post_digits.append(digit)
+            comp_id = comp_id * shift + d
+            have_post = True
 
-    if not pre_digits or not post_digits:
+    if not have_pre or not have_post:
         return None
 
-    loop_id = int("".join(str(d) for d in pre_digits))
-    comp_id = int("".join(str(d) for d in post_digits))
-
     # Return in (comp_id, loop_id) order
     return comp_id, loop_id
 
 
-def jfr_print_exec_samples(jfr_path: str) -> List[str]:
+# --------------------------------------------------------------------
+# Batched marker decode for the JFR path
+# --------------------------------------------------------------------
+# Each frame is reduced to an int code (its marker number, or one of the
+# constants below) and a whole chunk of stacks is decoded in one jitted call.
+# Ids are unbounded, so a stack whose ids would not fit in int64 is flagged by
+# the kernel and decoded again with decode_comp_loop_from_stack.
+
+_CODE_DELIM = -1
+_CODE_OTHER = -2
+_CODE_BIG = -3  # marker number too large to shift in int64
+
+_MARKER_CODE_LIMIT = 10 ** 18  # larger marker numbers get _CODE_BIG
+_ID_MAX = (1 << 63) - 1
+
+# _decode_stacks per-stack result
+_STACK_NONE = 0  # decode_comp_loop_from_stack would return None
+_STACK_OK = 1
+_STACK_BIG = 2  # an id would pass _ID_MAX; decode in Python
+
+
+def _frame_code(fn: str) -> int:
+    m = _FRAME_RE.search(fn)
+    if not m:
+        return _CODE_OTHER
+    if m.group("delim"):
+        return _CODE_DELIM
+    d = int(m.group("d"))
+    return d if d < _MARKER_CODE_LIMIT else _CODE_BIG
+
+
+@njit(cache=True)
+def _decode_stacks(codes, offsets, comp_ids, loop_ids, state):
+    """
+    decode_comp_loop_from_stack over stack s = codes[offsets[s]:offsets[s + 1]],
+    writing comp_ids[s] / loop_ids[s] and state[s] (one of the _STACK_* values).
+    """
+    for s in range(len(offsets) - 1):
+        loop_id = 0
+        comp_id = 0
+        have_pre = False
+        have_post = False
+        seen_delim = False
+        big = False
+        for k in range(offsets[s], offsets[s + 1]):
+            c = codes[k]
+            if c == _CODE_OTHER:
+                if seen_delim or have_pre:
+                    break
+                continue
+            if c == _CODE_DELIM:
+                seen_delim = True
+                continue
+            if c == _CODE_BIG:
+                big = True
+                break
+            # shift by the marker's digit count (Marker12 appends "12")
+            shift = 10
+            v = c
+            while v >= 10:
+                v //= 10
+                shift *= 10
+            if not seen_delim:
+                if loop_id > (_ID_MAX - c) // shift:
+                    big = True
+                    break
+                loop_id = loop_id * shift + c
+                have_pre = True
+            else:
+                if comp_id > (_ID_MAX - c) // shift:
+                    big = True
+                    break
+                comp_id = comp_id * shift + c
+                have_post = True
+        comp_ids[s] = comp_id
+        loop_ids[s] = loop_id
+        if big:
+            state[s] = _STACK_BIG
+        elif have_pre and have_post:
+            state[s] = _STACK_OK
+        else:
+            state[s] = _STACK_NONE
+
+
+# Compile once at import so the first recording does not pay for it.
+_decode_stacks(
+    np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64),
+    np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8),
+)
+
+
+def _count_stacks(
+    stacks: List[List[str]], frame_codes: Dict[str, int], loop_samples: Dict[Tuple[int, int], int],
+) -> int:
     """
-    Run `jfr print --events jdk.ExecutionSample <file>` and return stdout lines.
+    Decode one batch of stacks (frame lists) into loop_samples; return how many
+    decoded. frame_codes caches _frame_code across batches.
     """
-    proc = subprocess.run(
-        ["jfr", "print", "--events", "jdk.ExecutionSample", jfr_path],
-        capture_output=True,
+    n = len(stacks)
+    if n == 0:
+        return 0
+    codes: List[int] = []
+    offsets: List[int] = [0]
+    for frames in stacks:
+        for fn in frames:
+            c = frame_codes.get(fn)
+            if c is None:
+                c = frame_codes[fn] = _frame_code(fn)
+            codes.append(c)
+        offsets.append(len(codes))
+
+    comp_ids = np.empty(n, dtype=np.int64)
+    loop_ids = np.empty(n, dtype=np.int64)
+    state = np.empty(n, dtype=np.int8)
+    _decode_stacks(np.array(codes, dtype=np.int64), np.array(offsets, dtype=np.int64), comp_ids, loop_ids, state)
+
+    ok = state == _STACK_OK
+    keys, counts = np.unique(np.stack((comp_ids[ok], loop_ids[ok])), axis=1, return_counts=True)
+    for (comp_id, loop_id), c in zip(keys.T.tolist(), counts.tolist()):
+        loop_samples[(comp_id, loop_id)] += c
+    decoded = int(counts.sum())
+
+    # ids past int64 are rare; these few stacks take the arbitrary-precision path
+    for s in np.flatnonzero(state == _STACK_BIG).tolist():
+        key = decode_comp_loop_from_stack(stacks[s])
+        if key is not None:
+            loop_samples[key] += 1
+            decoded += 1
+    return decoded
+
+
+# `jfr print` stdout is consumed in chunks of this many characters
+JFR_READ_CHUNK = 1 << 20
+
+# One stackTrace block: frames run until a line starting with ']' (or, for a
+# truncated block, the next jdk.ExecutionSample header)
+_JFR_STACK_END = r"[^\S\n]*(?:\]|jdk\.ExecutionSample \{)"
+_JFR_STACK_RE = re.compile(
+    r"stackTrace = \[[^\n]*\n"
+    rf"((?:(?!{_JFR_STACK_END})[^\n]*\n)*)"
+    + _JFR_STACK_END
+)
+# A non-blank frame line, stripped and without its trailing comma(s)
+_JFR_FRAME_RE = re.compile(r"^[^\S\n]*([^\n]*[^\s,])", re.M)
+
+
+def _jfr_unterminated_frames(tail: str) -> List[str]:
+    """
+    Frames of a stackTrace block left open at the end of the output (no ']',
+    e.g. truncated `jfr print` output); [] if there is none.
+    """
+    start = tail.rfind("stackTrace = [")
+    if start < 0:
+        return []
+    nl = tail.find("\n", start)
+    return _JFR_FRAME_RE.findall(tail, nl + 1) if nl >= 0 else []
+
+
+def jfr_print_exec_samples(jfr_path: str) -> Iterator[str]:
+    """
+    Run `jfr print --events jdk.ExecutionSample <file>` and yield stdout in
+    JFR_READ_CHUNK-sized pieces as it arrives. stderr goes to a temp file so
+    jfr can't stall on a full pipe while we are still reading stdout.
+    """
+    cmd = ["jfr", "print", "--events", "jdk.ExecutionSample", jfr_path]
+    with tempfile.TemporaryFile() as err, subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=err,
         text=True,
-        check=True,
-    )
-    return proc.stdout.splitlines()
+    ) as proc:
+        yield from iter(lambda: proc.stdout.read(JFR_READ_CHUNK), "")
+        rc = proc.wait()
+        if rc != 0:
+            err.seek(0)
+            raise subprocess.CalledProcessError(rc, cmd, stderr=err.read().decode(errors="replace"))
 
 
 def parse_jfr_report(jfr_path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
@@ -113,59 +290,30 @@ def parse_jfr_report(jfr_path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
     if not os.path.isfile(jfr_path):
         raise FileNotFoundError(jfr_path)
 
-    lines = jfr_print_exec_samples(jfr_path)
-
     total_samples = 0
     loop_samples: Dict[Tuple[int, int], int] = defaultdict(int)
 
-    in_stack = False
-    current_stack: List[str] = []
-
-    def flush_stack():
-        nonlocal total_samples, current_stack
-        if not current_stack:
-            return
-        key = decode_comp_loop_from_stack(current_stack)
+    # Complete stackTrace blocks are decoded straight out of the buffer;
+    # whatever follows the last one is kept for the next chunk
+    buf = ""
+    frame_codes: Dict[str, int] = {}  # frame text -> code; frames repeat a lot
+    for chunk in jfr_print_exec_samples(jfr_path):
+        buf += chunk
+        end = 0
+        stacks: List[List[str]] = []
+        for m in _JFR_STACK_RE.finditer(buf):
+            end = m.end()
+            stacks.append(_JFR_FRAME_RE.findall(m.group(1)))
+        buf = buf[end:]
+        total_samples += _count_stacks(stacks, frame_codes, loop_samples)
+
+    # A last block cut off before its ']' still counts as one sample
+    frames = _jfr_unterminated_frames(buf)
+    if frames:
+        key = decode_comp_loop_from_stack(frames)
         if key is not None:
             loop_samples[key] += 1
             total_samples += 1
-        current_stack = []
-
-    for line in lines:
-        s = line.strip()
-
-        # Start of a new ExecutionSample – flush any previous stack
-        if s.startswith("jdk.ExecutionSample {"):
-            flush_stack()
-            in_stack = False
-            continue
-
-        # Start of stackTrace block
-        if "stackTrace = [" in s:
-            in_stack = True
-            current_stack = []
-            continue
-
-        if in_stack:
-            # End of stackTrace block
-            if s.startswith("]"):
-                flush_stack()
-                in_stack = False
-                continue
-
-            # Stack frame line, e.g.
-            #   BuboAgentCompilerMarkers.Marker2()
-            #   Mandelbrot.mandelbrot(int)
-            #   ...
-            if s:
-                frame = s.rstrip(",")
-                current_stack.append(frame)
-            continue
-
-        # Outside stackTrace: ignore other lines
-
-    # Flush any leftover stack at EOF
-    flush_stack()
 
     return total_samples, loop_samples
 
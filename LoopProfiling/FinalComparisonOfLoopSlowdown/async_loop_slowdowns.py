@@ -41,8 +41,8 @@ def load_runtime_overheads(csv_path: str) -> Dict[str, float]:
     return overheads
 
 
-_marker_re = re.compile(r"BuboAgentCompilerMarkers\.Marker(\d+)")
-_delim_re = re.compile(r"BuboAgentCompilerMarkers\.MarkerDelimiter")
+# One scan per frame: either the delimiter or a digit marker
+_FRAME_RE = re.compile(r"BuboAgentCompilerMarkers\.(?:Marker(?P<d>\d+)|(?P<delim>MarkerDelimiter))")
 
 
 def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
@@ -53,35 +53,37 @@ def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
     IMPORTANT: markers BEFORE the delimiter encode the **loop_id**,
                markers AFTER the delimiter encode the **comp_id**.
     """
-    pre_digits: List[int] = []   # loop id
-    post_digits: List[int] = []  # comp id
+    # Marker digits are accumulated as running ints (Marker1, Marker2 -> 12)
+    loop_id = comp_id = 0
+    have_pre = have_post = False
     seen_delim = False
 
     for fn in frames:
-        if _delim_re.search(fn):
-            seen_delim = True
-            continue
-
-        m = _marker_re.search(fn)
+        m = _FRAME_RE.search(fn)
         if not m:
             # Once we've started seeing markers, stop when we hit non-marker.
-            if seen_delim or pre_digits:
+            if seen_delim or have_pre:
                 break
             else:
                 continue
 
-        digit = int(m.group(1))
+        if m.group("delim"):
+            seen_delim = True
+            continue
+
+        # shift by the digits of int(d), so zero-padded Marker007 appends "7"
+        d = int(m.group("d"))
+        shift = 10 ** len(str(d))
         if not seen_delim:
-            pre_digits.append(digit)
+            loop_id = loop_id * shift + d
+            have_pre = True
         else:
-            post_digits.append(digit)
+            comp_id = comp_id * shift + d
+            have_post = True
 
-    if not pre_digits or not post_digits:
+    if not have_pre or not have_post:
         return None
 
-    loop_id = int("".join(str(d) for d in pre_digits))
-    comp_id = int("".join(str(d) for d in post_digits))
-
     # NOTE: return order is (comp_id, loop_id)
     return comp_id, loop_id
 
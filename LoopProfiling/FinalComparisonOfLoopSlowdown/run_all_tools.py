@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import csv
+import heapq
 import subprocess
 from typing import Dict, Optional, Tuple, List
 
@@ -29,28 +30,20 @@ COMBINED_PLOT_DIR = "CombinedToolPlots"
 # --------------------------------------------------------------------
 
 
-def load_runtime_overheads(path: str) -> Dict[str, float]:
+def load_runtime_overheads(path: str) -> Tuple[List[str], Dict[str, float]]:
     """
-    Load runtime_overheads.csv and return:
-        { benchmark -> slowdown_noBubo_pct }
+    Load runtime_overheads.csv in a single pass and return:
+        ([benchmark, ...] in file order, { benchmark -> slowdown_noBubo_pct })
     """
+    benchmarks: List[str] = []
     slowdown_map: Dict[str, float] = {}
     with open(path, newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             bm = row["benchmark"]
+            benchmarks.append(bm)
             slowdown_map[bm] = float(row["slowdown_noBubo_pct"])
-    return slowdown_map
-
-
-def get_benchmarks_from_runtime_csv(path: str) -> List[str]:
-    """Return the list of benchmarks in runtime_overheads.csv."""
-    benchmarks: List[str] = []
-    with open(path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            benchmarks.append(row["benchmark"])
-    return benchmarks
+    return benchmarks, slowdown_map
 
 
 def ensure_dir(path: str) -> None:
@@ -254,11 +247,9 @@ def main():
     if not os.path.isfile(RUNTIME_CSV):
         raise SystemExit(f"Cannot find {RUNTIME_CSV} in current directory.")
 
-    benchmarks = get_benchmarks_from_runtime_csv(RUNTIME_CSV)
+    benchmarks, slowdown_map = load_runtime_overheads(RUNTIME_CSV)
     print("Benchmarks (from runtime_overheads.csv):", ", ".join(benchmarks))
 
-    slowdown_map = load_runtime_overheads(RUNTIME_CSV)
-
     # 2) ensure per-tool CSVs exist; run scripts if necessary
     if need_to_run_tool(BUBO_CSV_DIR):
         run_subprocess_script(BUBO_SCRIPT)
@@ -288,21 +279,31 @@ def load_top_n(path, tool_name, has_loop_call_count, n=5):
     if not os.path.isfile(path):
         return []
 
+    # Only the top-n rows survive, so keep rows as plain lists and let
+    # heapq pick the survivors; dicts are built for those rows only.
     with open(path, newline="") as f:
-        rows = list(csv.DictReader(f))
-
-    rows.sort(key=lambda r: float(r["runtime_share_pct"]), reverse=True)
-    rows = rows[:n]
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        idx = {name: i for i, name in enumerate(header)}
+        share_i = idx["runtime_share_pct"]
+        top = heapq.nlargest(n, reader, key=lambda row: float(row[share_i]))
+
+    comp_i = idx["comp_id"]
+    loop_i = idx["loop_id"]
+    slow_i = idx["slowdown_pct"]
+    calls_i = idx["loop_call_count"] if has_loop_call_count else None
 
     out = []
-    for r in rows:
+    for r in top:
         out.append({
             "tool": tool_name,
-            "comp_id": int(r["comp_id"]),
-            "loop_id": int(r["loop_id"]),
-            "slowdown_pct": float(r["slowdown_pct"]),
-            "runtime_share_pct": float(r["runtime_share_pct"]),
-            "loop_call_count": int(r["loop_call_count"]) if has_loop_call_count else 0,
+            "comp_id": int(r[comp_i]),
+            "loop_id": int(r[loop_i]),
+            "slowdown_pct": float(r[slow_i]),
+            "runtime_share_pct": float(r[share_i]),
+            "loop_call_count": int(r[calls_i]) if has_loop_call_count else 0,
         })
     return out
 
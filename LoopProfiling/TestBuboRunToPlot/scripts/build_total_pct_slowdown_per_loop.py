@@ -1,13 +1,34 @@
 #!/usr/bin/env python3
 import argparse
+import array
 import csv
+import io
 import json
+import mmap
 import os
 import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterable, List, Optional, Tuple, Set
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# orjson is optional; both loaders take the raw file bytes
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# comp_id -> method_norm -> graal_block_id -> loop_id
+NodeMap = Dict[int, Dict[str, Dict[int, int]]]
+# method_norm -> graal_block_id -> latest (highest) comp_id holding that block
+LatestCompMap = Dict[str, Dict[int, int]]
+# comp_id -> method_norm -> loop_id -> set(graal_probe_block_ids)
+ProbeBlocks = Dict[int, Dict[str, Dict[int, Set[int]]]]
+
 
 # ============================================================
 # Part 1: HumphreysDebugDataPhase output -> per-comp DOT files
@@ -266,43 +287,28 @@ def write_dots_from_debug(debug_txt_path: str, dots_outdir: str) -> List[str]:
 #          + NEW: probe_nodes.csv (probe-node -> LoopID)
 # ============================================================
 
-GRAPH_LABEL_RE = re.compile(r'^\s*label="([^"]+)";\s*$')
-NODE_START_RE = re.compile(r'^\s*(b\d+)\s*\[\s*label="')
-EDGE_RE = re.compile(r'^\s*(b\d+)\s*->\s*(b\d+)\s*;')
+# Graph label, edge and node-start lines, matched on the raw bytes of a DOT file.
+# [^\S\n] is whitespace other than a newline, so a match never leaves its line.
+# Node names are b<graal block id>; only the numeric id is captured.
+DOT_LINE_RE = re.compile(
+    rb"""^[^\S\n]*(?:
+        label="(?P<glabel>[^"\n]+)";[^\S\n]*$
+      | b(?P<src>\d+)[^\S\n]*->[^\S\n]*b(?P<dst>\d+)[^\S\n]*;
+      | b(?P<node>\d+)[^\S\n]*\[[^\S\n]*label="
+    )""",
+    re.M | re.X,
+)
 LOOP_LINE_RE = re.compile(r'Loop:\s*(<none>|L\d+)\b')
 RDTSC_RE = re.compile(r'AMD64BuboRDTSCToSlot\s*\(LoopID=(\d+)\)')
-
-
-def extract_label_value(node_chunk: str) -> str:
-    key = 'label="'
-    start = node_chunk.find(key)
-    if start < 0:
-        return ""
-    p = start + len(key)
-
-    out = []
-    escaped = False
-    while p < len(node_chunk):
-        ch = node_chunk[p]
-        if escaped:
-            out.append(ch)
-            escaped = False
-        else:
-            if ch == '\\':
-                escaped = True
-                out.append(ch)
-            elif ch == '"':
-                break
-            else:
-                out.append(ch)
-        p += 1
-    return "".join(out)
+GRAPH_LABEL_INNER_RE = re.compile(r'^\s*(\d+)\s*-\s*(.+?)\s*$')
+# Raw (still escaped) node label body; stops at the first unescaped quote or the chunk end
+LABEL_VALUE_RE = re.compile(rb'(?:\\.|[^"\\])*\\?', re.DOTALL)
 
 
 def parse_graph_label(label: str) -> Tuple[Optional[int], str]:
     comp_id = None
     method = label
-    m = re.match(r'^\s*(\d+)\s*-\s*(.+?)\s*$', label)
+    m = GRAPH_LABEL_INNER_RE.match(label)
     if m:
         comp_id = int(m.group(1))
         rest = m.group(2).strip()
@@ -310,73 +316,75 @@ def parse_graph_label(label: str) -> Tuple[Optional[int], str]:
     return comp_id, method
 
 
-def parse_dot(path: str) -> Tuple[Optional[int], str, Dict[str, str], Dict[str, int], List[Tuple[str, str]]]:
-    lines = Path(path).read_text(encoding="utf-8", errors="replace").splitlines(True)
-
+def parse_dot(path: str) -> Tuple[Optional[int], str, Dict[int, str], Dict[int, int], Dict[int, List[int]]]:
+    """Nodes are keyed by their numeric block id (b12 -> 12)."""
     graph_label: Optional[str] = None
-    node_looplabel: Dict[str, str] = {}
-    node_rdtsc_loopid: Dict[str, int] = {}
-    edges: List[Tuple[str, str]] = []
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].rstrip("\n")
-
-        m = GRAPH_LABEL_RE.match(line.strip())
-        if m:
-            graph_label = m.group(1)
-
-        em = EDGE_RE.match(line)
-        if em:
-            edges.append((em.group(1), em.group(2)))
-            i += 1
-            continue
-
-        nm = NODE_START_RE.match(line)
-        if nm:
-            node_id = nm.group(1)
+    node_looplabel: Dict[int, str] = {}
+    node_rdtsc_loopid: Dict[int, int] = {}
+    # Successor lists, built straight from the edge lines
+    succs: Dict[int, List[int]] = defaultdict(list)
+
+    # Bound methods as locals: avoids a global + attribute lookup per match
+    line_search = DOT_LINE_RE.search
+    label_match = LABEL_VALUE_RE.match
+    loop_search = LOOP_LINE_RE.search
+    rdtsc_search = RDTSC_RE.search
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, "", node_looplabel, node_rdtsc_loopid, succs
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0
+            while True:
+                m = line_search(mm, pos)
+                if m is None:
+                    break
+                pos = m.end()
+
+                if m.group("glabel") is not None:
+                    graph_label = m.group("glabel").decode("utf-8", errors="replace")
+                    continue
 
-            chunk = line
-            j = i + 1
-            while j < len(lines) and "];" not in chunk:
-                chunk += lines[j]
-                j += 1
+                if m.group("src") is not None:
+                    succs[int(m.group("src"))].append(int(m.group("dst")))
+                    continue
 
-            label_text = extract_label_value(chunk)
+                node_id = int(m.group("node"))
 
-            lm = LOOP_LINE_RE.search(label_text)
-            if lm:
-                v = lm.group(1)
-                if v != "<none>":
-                    node_looplabel[node_id] = v
+                # The node statement runs to the end of the line holding "];"
+                end = mm.find(b"];", m.start())
+                end = size if end < 0 else end
+                line_end = mm.find(b"\n", end)
+                pos = size if line_end < 0 else line_end + 1
 
-            rm = RDTSC_RE.search(label_text)
-            if rm:
-                node_rdtsc_loopid[node_id] = int(rm.group(1))
+                # Match the label in place; only the value itself is decoded
+                label_text = label_match(mm, m.end(), pos).group().decode("utf-8", errors="replace")
 
-            i = j
-            continue
+                lm = loop_search(label_text)
+                if lm:
+                    v = lm.group(1)
+                    if v != "<none>":
+                        node_looplabel[node_id] = v
 
-        i += 1
+                rm = rdtsc_search(label_text)
+                if rm:
+                    node_rdtsc_loopid[node_id] = int(rm.group(1))
 
     comp_id, method = (None, "")
     if graph_label is not None:
         comp_id, method = parse_graph_label(graph_label)
 
-    return comp_id, method, node_looplabel, node_rdtsc_loopid, edges
+    return comp_id, method, node_looplabel, node_rdtsc_loopid, succs
 
 
 def infer_looplabel_to_loopid(
-    node_looplabel: Dict[str, str],
-    node_rdtsc_loopid: Dict[str, int],
-    edges: List[Tuple[str, str]]
+    node_looplabel: Dict[int, str],
+    node_rdtsc_loopid: Dict[int, int],
+    succs: Dict[int, List[int]]
 ) -> Dict[str, int]:
     looplabel_to_id: Dict[str, int] = {}
 
-    succs: Dict[str, List[str]] = {}
-    for s, d in edges:
-        succs.setdefault(s, []).append(d)
-
     for src, k in node_rdtsc_loopid.items():
         for dst in succs.get(src, []):
             lx = node_looplabel.get(dst)
@@ -389,11 +397,11 @@ def infer_looplabel_to_loopid(
 
 
 def infer_probe_nodes_for_loopid(
-    node_looplabel: Dict[str, str],
-    node_rdtsc_loopid: Dict[str, int],
-    edges: List[Tuple[str, str]],
+    node_looplabel: Dict[int, str],
+    node_rdtsc_loopid: Dict[int, int],
+    succs: Dict[int, List[int]],
     looplabel_to_id: Dict[str, int],
-) -> Dict[int, Set[str]]:
+) -> Dict[int, Set[int]]:
     """
     NEW:
     Determine which CFG nodes are "probe nodes" for each loop_id.
@@ -404,11 +412,8 @@ def infer_probe_nodes_for_loopid(
         using looplabel_to_id.
       - If we can't find a loop-labeled successor, fall back to the marker LoopID.
     """
-    succs: Dict[str, List[str]] = {}
-    for s, d in edges:
-        succs.setdefault(s, []).append(d)
 
-    out: Dict[int, Set[str]] = defaultdict(set)
+    out: Dict[int, Set[int]] = defaultdict(set)
 
     for src, marker_loopid in node_rdtsc_loopid.items():
         assigned: Optional[int] = None
@@ -429,98 +434,115 @@ def infer_probe_nodes_for_loopid(
     return out
 
 
-def write_loops_csv_from_dots(dots_dir: str, out_csv: str) -> int:
-    dot_files: List[str] = []
-    for root, _, files in os.walk(dots_dir):
-        for fn in files:
-            if fn.lower().endswith(".dot"):
-                dot_files.append(os.path.join(root, fn))
-    dot_files.sort()
-    if not dot_files:
-        raise SystemExit(f"No .dot files found in: {dots_dir}")
+# Large write buffer for the streamed CSV outputs (fewer write syscalls)
+CSV_WRITE_BUFFER = 1 << 20
 
-    os.makedirs(os.path.dirname(out_csv) or ".", exist_ok=True)
 
-    rows = []
-    for path in dot_files:
-        comp_id, method, node_looplabel, node_rdtsc_loopid, edges = parse_dot(path)
-        looplabel_to_id = infer_looplabel_to_loopid(node_looplabel, node_rdtsc_loopid, edges)
+def _iter_dot_files(root: str):
+    """Yield .dot paths under root; DirEntry caches the file type, so no extra stat per entry."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".dot") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
 
-        for node, lx in sorted(node_looplabel.items(), key=lambda kv: int(kv[0][1:])):
-            if lx not in looplabel_to_id:
-                continue
-            rows.append({
-                "comp_id": comp_id if comp_id is not None else "",
-                "method": method,
-                "node": node,
-                "loop_id": looplabel_to_id[lx],
-            })
 
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["comp_id", "method", "node", "loop_id"])
-        w.writeheader()
-        w.writerows(rows)
+def _dot_csv_rows(path: str) -> Tuple[List[Tuple], List[Tuple]]:
+    """Parses one DOT and returns its (loops.csv rows, probe_nodes.csv rows); runs in a worker process."""
+    comp_id, method, node_looplabel, node_rdtsc_loopid, succs = parse_dot(path)
+    looplabel_to_id = infer_looplabel_to_loopid(node_looplabel, node_rdtsc_loopid, succs)
 
-    return len(rows)
+    comp_field = comp_id if comp_id is not None else ""
+    # int keys: the sort compares in C, no per-item key callback
+    loop_rows = [
+        (comp_field, method, f"b{bid}", looplabel_to_id[lx])
+        for bid, lx in sorted(node_looplabel.items())
+        if lx in looplabel_to_id
+    ]
 
+    probe_rows: List[Tuple] = []
+    if comp_id is None:
+        return loop_rows, probe_rows
 
-def write_probe_nodes_csv_from_dots(dots_dir: str, out_csv: str) -> int:
-    """
-    NEW:
-    Writes a mapping of (comp_id, method, loop_id) -> probe_node (bNNN) and probe_graal_block_id (NNN).
+    probe_nodes_by_loopid = infer_probe_nodes_for_loopid(
+        node_looplabel=node_looplabel,
+        node_rdtsc_loopid=node_rdtsc_loopid,
+        succs=succs,
+        looplabel_to_id=looplabel_to_id,
+    )
 
-    This is used later to add the *RDTSC segment time* for the probe blocks into each loop total.
-    """
-    dot_files: List[str] = []
-    for root, _, files in os.walk(dots_dir):
-        for fn in files:
-            if fn.lower().endswith(".dot"):
-                dot_files.append(os.path.join(root, fn))
-    dot_files.sort()
-    if not dot_files:
-        raise SystemExit(f"No .dot files found in: {dots_dir}")
+    for loop_id, nodes in probe_nodes_by_loopid.items():
+        for bid in sorted(nodes):
+            probe_rows.append((comp_id, method, loop_id, f"b{bid}", bid))
 
-    os.makedirs(os.path.dirname(out_csv) or ".", exist_ok=True)
+    return loop_rows, probe_rows
 
-    NODE_RE_LOCAL = re.compile(r"^b(\d+)$")
 
-    rows = []
-    for path in dot_files:
-        comp_id, method, node_looplabel, node_rdtsc_loopid, edges = parse_dot(path)
-        if comp_id is None:
-            continue
+def write_all_csvs_from_dots(
+    dots_dir: str,
+    loops_csv: str,
+    probe_nodes_csv: str,
+    jobs: Optional[int] = None,
+) -> Tuple[int, int, Tuple[LatestCompMap, NodeMap], ProbeBlocks]:
+    """
+    Parses every DOT once (in parallel over `jobs` processes) and writes both:
+      - loops.csv:       (comp_id, method, node) -> loop_id
+      - probe_nodes.csv: (comp_id, method, loop_id) -> probe_node (bNNN) and probe_graal_block_id (NNN)
 
-        looplabel_to_id = infer_looplabel_to_loopid(node_looplabel, node_rdtsc_loopid, edges)
-        probe_nodes_by_loopid = infer_probe_nodes_for_loopid(
-            node_looplabel=node_looplabel,
-            node_rdtsc_loopid=node_rdtsc_loopid,
-            edges=edges,
-            looplabel_to_id=looplabel_to_id,
-        )
+    probe_nodes.csv is used later to add the *RDTSC segment time* for the probe blocks into each loop total.
+    The same rows are also indexed in memory (as read_dot_node_map / read_probe_nodes_csv would
+    return them) so build_totals_from_raw need not read the CSVs back.
 
-        for loop_id, nodes in probe_nodes_by_loopid.items():
-            for node in sorted(nodes, key=lambda n: int(n[1:])):
-                m = NODE_RE_LOCAL.match(node)
-                if not m:
-                    continue
-                graal_block_id = int(m.group(1))
-                rows.append({
-                    "comp_id": comp_id,
-                    "method": method,
-                    "loop_id": loop_id,
-                    "probe_node": node,
-                    "probe_graal_block_id": graal_block_id,
-                })
-
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=["comp_id", "method", "loop_id", "probe_node", "probe_graal_block_id"]
-        )
-        w.writeheader()
-        w.writerows(rows)
+    Returns:
+      (loops_rows, probe_rows, dot_node_map, probe_blocks_by_loop)
+    """
+    dot_files = sorted(_iter_dot_files(dots_dir))
+    if not dot_files:
+        raise SystemExit(f"No .dot files found in: {dots_dir}")
 
-    return len(rows)
+    os.makedirs(os.path.dirname(loops_csv) or ".", exist_ok=True)
+    os.makedirs(os.path.dirname(probe_nodes_csv) or ".", exist_ok=True)
+
+    nrows = 0
+    pn = 0
+    node_entries: List[Tuple[int, str, int, int]] = []
+    probe_entries: List[Tuple[int, str, int, int]] = []
+    # Both CSVs are small: format them in memory and write each with a single call
+    loops_buf = io.StringIO()
+    probe_buf = io.StringIO()
+    loops_w = csv.writer(loops_buf)
+    loops_w.writerow(("comp_id", "method", "node", "loop_id"))
+    probe_w = csv.writer(probe_buf)
+    probe_w.writerow(("comp_id", "method", "loop_id", "probe_node", "probe_graal_block_id"))
+
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+
+        # map() yields in submission order, so rows keep the sorted file order
+        for loop_rows, probe_rows in ex.map(_dot_csv_rows, dot_files, chunksize=32):
+            loops_w.writerows(loop_rows)
+            probe_w.writerows(probe_rows)
+            nrows += len(loop_rows)
+            pn += len(probe_rows)
+
+            # Same filtering and normalisation as reading the CSVs back
+            node_entries.extend(
+                (comp_id, normalise_method_name(method), int(node[1:]), loop_id)
+                for comp_id, method, node, loop_id in loop_rows
+                if comp_id != "" and method.strip()
+            )
+            probe_entries.extend(
+                (comp_id, normalise_method_name(method), loop_id, graal_bid)
+                for comp_id, method, loop_id, _, graal_bid in probe_rows
+                if method.strip()
+            )
+
+    Path(loops_csv).write_text(loops_buf.getvalue(), encoding="utf-8", newline="")
+    Path(probe_nodes_csv).write_text(probe_buf.getvalue(), encoding="utf-8", newline="")
+
+    return nrows, pn, index_dot_node_map(node_entries), index_probe_nodes(probe_entries)
 
 
 # ============================================================
@@ -528,22 +550,21 @@ def write_probe_nodes_csv_from_dots(dots_dir: str, out_csv: str) -> int:
 #          + NEW: Add probe RDTSC segment times into loop totals
 # ============================================================
 
-LINE_RE = re.compile(
-    r"^Method:\s*(?P<method>.*?),\s*"
-    r"Block ID:\s*(?P<block>\d+),\s*"
-    r"Normal Time:\s*(?P<normal>-?\d+(?:\.\d+)?),\s*"
-    r"Slowdown Time:\s*(?P<slow>-?\d+(?:\.\d+)?),\s*"
-    r"Percentage Increase:\s*(?P<pct>-?\d+(?:\.\d+)?)(?:%)?\s*$"
+# Per-block lines and (NEW) RDTSC probe-segment lines from the same input file, in one pattern:
+#   Method: M, Block ID: N, Normal Time: x, Slowdown Time: y, Percentage Increase: p%
+#   Method: M, Block ID: N, RDTSC Normal Time: x, RDTSC Slowdown Time: y, RDTSC Percentage Increase: p%
+# Matched over the raw bytes with re.M; [^\S\n] keeps each match on its own line.
+SLOWDOWN_LINE_RE = re.compile(
+    rb"^[^\S\n]*Method:[^\S\n]*(?P<method>.*?),[^\S\n]*"
+    rb"Block ID:[^\S\n]*(?P<block>\d+),[^\S\n]*"
+    rb"(?P<rdtsc>RDTSC )?Normal Time:[^\S\n]*(?P<normal>-?\d+(?:\.\d+)?),[^\S\n]*"
+    rb"(?(rdtsc)RDTSC )Slowdown Time:[^\S\n]*(?P<slow>-?\d+(?:\.\d+)?),[^\S\n]*"
+    rb"(?(rdtsc)RDTSC )Percentage Increase:[^\S\n]*(?P<pct>-?\d+(?:\.\d+)?)(?:%)?[^\S\n]*$",
+    re.M,
 )
 
-# NEW: probe-segment lines (same input file)
-RDTSC_LINE_RE = re.compile(
-    r"^Method:\s*(?P<method>.*?),\s*"
-    r"Block ID:\s*(?P<block>\d+),\s*"
-    r"RDTSC Normal Time:\s*(?P<normal>-?\d+(?:\.\d+)?),\s*"
-    r"RDTSC Slowdown Time:\s*(?P<slow>-?\d+(?:\.\d+)?),\s*"
-    r"RDTSC Percentage Increase:\s*(?P<pct>-?\d+(?:\.\d+)?)(?:%)?\s*$"
-)
+# Window used when counting lines in a mapped file
+LINE_COUNT_CHUNK = 1 << 20
 
 NODE_RE = re.compile(r"^b(?P<num>\d+)$")
 BRIDGE_KEY_RE = re.compile(r"^\s*(?P<graal>\d+)\s*\(Vtune Block\s*(?P<vtune>\d+)\)\s*$")
@@ -568,7 +589,8 @@ class RdtscRow:
 
 
 def normalise_method_name(s: str) -> str:
-    return s.strip().replace("::", ".")
+    # Interned: these names key every lookup dict and (comp_id, method, loop_id) tuple
+    return sys.intern(s.strip().replace("::", "."))
 
 
 def read_slowdown_and_rdtsc_rows(path: str) -> Tuple[List[BlockRow], Dict[Tuple[str, int], RdtscRow], int, int, int]:
@@ -587,49 +609,49 @@ def read_slowdown_and_rdtsc_rows(path: str) -> Tuple[List[BlockRow], Dict[Tuple[
     matched_rdtsc = 0
     total = 0
 
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        for raw in f:
-            total += 1
-            line = raw.strip()
-            if not line:
-                continue
-
-            m = LINE_RE.match(line)
-            if m:
-                method_raw = m.group("method").strip()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return block_rows, rdtsc_map, matched_blocks, matched_rdtsc, total
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            total = sum(
+                mm[i:i + LINE_COUNT_CHUNK].count(b"\n") for i in range(0, size, LINE_COUNT_CHUNK)
+            )
+            if mm[size - 1] != ord("\n"):
+                total += 1
+
+            for m in SLOWDOWN_LINE_RE.finditer(mm):
+                method_raw = m.group("method").strip().decode("utf-8", errors="replace")
                 method_norm = normalise_method_name(method_raw)
-                block_rows.append(BlockRow(
-                    method_raw=method_raw,
-                    method_norm=method_norm,
-                    block_id=int(m.group("block")),
-                    normal_time=float(m.group("normal")),
-                    slowdown_time=float(m.group("slow")),
-                ))
-                matched_blocks += 1
-                continue
 
-            r = RDTSC_LINE_RE.match(line)
-            if r:
-                method_raw = r.group("method").strip()
-                method_norm = normalise_method_name(method_raw)
-                vtune_block_id = int(r.group("block"))
+                if m.group("rdtsc") is None:
+                    block_rows.append(BlockRow(
+                        method_raw=method_raw,
+                        method_norm=method_norm,
+                        block_id=int(m.group("block")),
+                        normal_time=float(m.group("normal")),
+                        slowdown_time=float(m.group("slow")),
+                    ))
+                    matched_blocks += 1
+                    continue
+
+                vtune_block_id = int(m.group("block"))
                 rr = RdtscRow(
                     method_raw=method_raw,
                     method_norm=method_norm,
                     vtune_block_id=vtune_block_id,
-                    rdtsc_normal=float(r.group("normal")),
-                    rdtsc_slow=float(r.group("slow")),
+                    rdtsc_normal=float(m.group("normal")),
+                    rdtsc_slow=float(m.group("slow")),
                 )
                 # If duplicates exist, keep the last (they should be identical; last-wins is fine)
                 rdtsc_map[(method_norm, vtune_block_id)] = rr
                 matched_rdtsc += 1
-                continue
 
     return block_rows, rdtsc_map, matched_blocks, matched_rdtsc, total
 
 
 def read_bridge_vtune_to_graal(path: str) -> Dict[str, Dict[int, int]]:
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    data = json_loads(Path(path).read_bytes())
     out: Dict[str, Dict[int, int]] = {}
 
     for method, mapping in data.items():
@@ -660,7 +682,7 @@ def read_markerphase_graal_to_vtune(path: str) -> Dict[str, Dict[int, int]]:
 
     We invert it to: method_norm -> (graal_block_id -> vtune_block_id)
     """
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    data = json_loads(Path(path).read_bytes())
     out: Dict[str, Dict[int, int]] = {}
 
     if not isinstance(data, dict):
@@ -692,9 +714,29 @@ def read_markerphase_graal_to_vtune(path: str) -> Dict[str, Dict[int, int]]:
     return out
 
 
-def read_dot_node_map(path: str) -> Tuple[Dict[str, List[int]], Dict[Tuple[int, str, int], int]]:
-    method_to_comps_set: Dict[str, set] = defaultdict(set)
-    node_map: Dict[Tuple[int, str, int], int] = {}
+def index_dot_node_map(entries: Iterable[Tuple[int, str, int, int]]) -> Tuple[LatestCompMap, NodeMap]:
+    """
+    Indexes (comp_id, method_norm, graal_block_id, loop_id) entries.
+
+    Returns:
+      (latest_comp, node_map)
+    """
+    latest_comp: LatestCompMap = defaultdict(dict)
+    node_map: NodeMap = defaultdict(lambda: defaultdict(dict))
+
+    for comp_id, method_norm, block_id, loop_id in entries:
+        node_map[comp_id][method_norm][block_id] = loop_id
+        by_block = latest_comp[method_norm]
+        prev = by_block.get(block_id)
+        if prev is None or comp_id > prev:
+            by_block[block_id] = comp_id
+
+    return latest_comp, node_map
+
+
+def read_dot_node_map(path: str) -> Tuple[LatestCompMap, NodeMap]:
+    """Reads loops.csv into index_dot_node_map's structures."""
+    entries: List[Tuple[int, str, int, int]] = []
 
     with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
         r = csv.DictReader(f)
@@ -715,25 +757,29 @@ def read_dot_node_map(path: str) -> Tuple[Dict[str, List[int]], Dict[Tuple[int,
             if not nm:
                 continue
 
-            comp_id = int(comp_s)
-            method_norm = normalise_method_name(method)
-            block_id = int(nm.group("num"))
-            loop_id = int(loop_s)
+            entries.append((int(comp_s), normalise_method_name(method), int(nm.group("num")), int(loop_s)))
 
-            node_map[(comp_id, method_norm, block_id)] = loop_id
-            method_to_comps_set[method_norm].add(comp_id)
+    return index_dot_node_map(entries)
 
-    method_to_comps_sorted: Dict[str, List[int]] = {m: sorted(cs) for m, cs in method_to_comps_set.items()}
-    return method_to_comps_sorted, node_map
+
+def index_probe_nodes(entries: Iterable[Tuple[int, str, int, int]]) -> ProbeBlocks:
+    """
+    NEW:
+    Indexes (comp_id, method_norm, loop_id, graal_probe_block_id) entries as:
+      comp_id -> method_norm -> loop_id -> set(graal_probe_block_ids)
+    """
+    out: ProbeBlocks = defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
+    for comp_id, method_norm, loop_id, graal_bid in entries:
+        out[comp_id][method_norm][loop_id].add(graal_bid)
+    return out
 
 
-def read_probe_nodes_csv(path: str) -> Dict[Tuple[int, str, int], Set[int]]:
+def read_probe_nodes_csv(path: str) -> ProbeBlocks:
     """
     NEW:
-    Reads probe_nodes.csv and returns:
-      (comp_id, method_norm, loop_id) -> set(graal_probe_block_ids)
+    Reads probe_nodes.csv into index_probe_nodes' structure.
     """
-    out: Dict[Tuple[int, str, int], Set[int]] = defaultdict(set)
+    entries: List[Tuple[int, str, int, int]] = []
 
     with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
         r = csv.DictReader(f)
@@ -757,50 +803,96 @@ def read_probe_nodes_csv(path: str) -> Dict[Tuple[int, str, int], Set[int]]:
             except ValueError:
                 continue
 
-            method_norm = normalise_method_name(method)
-            out[(comp_id, method_norm, loop_id)].add(graal_bid)
+            entries.append((comp_id, normalise_method_name(method), loop_id, graal_bid))
+
+    return index_probe_nodes(entries)
+
+
+def method_alias_name(method_norm: str) -> str:
+    """The :: <-> . fallback spelling of a method name, normalised."""
+    alt = method_norm.replace(".", "::") if "." in method_norm else method_norm.replace("::", ".")
+    return normalise_method_name(alt)
 
-    return out
+
+def build_method_aliases(method_norms: Iterable[str]) -> Dict[str, str]:
+    """Fallback name per method, computed once; methods whose alias is themselves are left out."""
+    aliases: Dict[str, str] = {}
+    for m in set(method_norms):
+        alt = method_alias_name(m)
+        if alt != m:
+            aliases[m] = alt
+    return aliases
 
 
 def find_comp_for_method_block(
     method_norm: str,
     block_id: int,
-    method_to_comps: Dict[str, List[int]],
-    node_map: Dict[Tuple[int, str, int], int],
-    enable_fallback: bool,
+    latest_comp: LatestCompMap,
+    method_aliases: Dict[str, str],
 ) -> Optional[int]:
-    comps = method_to_comps.get(method_norm, [])
-    for cid in reversed(comps):
-        if (cid, method_norm, block_id) in node_map:
-            return cid
+    cid = latest_comp.get(method_norm, {}).get(block_id)
+    if cid is not None:
+        return cid
 
-    if not enable_fallback:
+    alt_norm = method_aliases.get(method_norm)
+    if alt_norm is None:
         return None
-
-    alt = method_norm.replace(".", "::") if "." in method_norm else method_norm.replace("::", ".")
-    alt_norm = normalise_method_name(alt)
-    comps = method_to_comps.get(alt_norm, [])
-    for cid in reversed(comps):
-        if (cid, alt_norm, block_id) in node_map:
-            return cid
-    return None
+    return latest_comp.get(alt_norm, {}).get(block_id)
 
 
-@dataclass
+# Per-loop state; block counts and base sums are taken from the block columns with np.bincount
+@dataclass(slots=True)
 class LoopAgg:
-    num_blocks: int = 0
-    sum_normal: float = 0.0
-    sum_slow: float = 0.0
     # NEW: probe segment sums
     probe_sum_normal: float = 0.0
     probe_sum_slow: float = 0.0
+    # dense index into the per-loop total arrays
+    gid: int = -1
+
+
+def add_probe_segments(
+    g: LoopAgg,
+    method_norm: str,
+    probe_graal_blocks: Set[int],
+    graal_to_vtune: Optional[Dict[int, int]],
+    rdtsc_map: Dict[Tuple[str, int], RdtscRow],
+) -> Tuple[int, int, int]:
+    """
+    NEW:
+    Adds the RDTSC segment times of a loop's probe blocks into its LoopAgg.
+
+    Returns:
+      (probe_blocks_added, missing_markerphase_entries, missing_rdtsc_lines)
+    """
+    if not graal_to_vtune:
+        return 0, len(probe_graal_blocks), 0
+
+    added = 0
+    missing_map = 0
+    missing_rdtsc = 0
+
+    for graal_bid in probe_graal_blocks:
+        vtune_bid = graal_to_vtune.get(graal_bid)
+        if vtune_bid is None:
+            missing_map += 1
+            continue
+
+        rr = rdtsc_map.get((method_norm, vtune_bid))
+        if rr is None:
+            missing_rdtsc += 1
+            continue
+
+        g.probe_sum_normal += rr.rdtsc_normal
+        g.probe_sum_slow += rr.rdtsc_slow
+        added += 1
 
+    return added, missing_map, missing_rdtsc
 
-def safe_pct_increase(normal: float, slow: float) -> float:
-    if normal <= 0.0:
-        return 0.0
-    return ((slow - normal) / normal) * 100.0
+
+def pct_increase_array(normal: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """Element-wise percentage increase from normal to slow; 0.0 wherever normal <= 0."""
+    ratio = np.divide(slow - normal, normal, out=np.zeros_like(normal), where=normal > 0.0)
+    return ratio * 100.0
 
 
 def build_totals_from_raw(
@@ -814,11 +906,24 @@ def build_totals_from_raw(
     bridge_json: Optional[str],
     enable_method_fallback_match: bool,
     min_normal_time_per_block: float,
+    dot_node_map: Optional[Tuple[LatestCompMap, NodeMap]] = None,
+    probe_blocks_by_loop: Optional[ProbeBlocks] = None,
 ) -> None:
+    """
+    dot_node_map / probe_blocks_by_loop: the in-memory loops.csv / probe_nodes.csv
+    contents from write_all_csvs_from_dots; the CSVs are only read when these are None.
+    """
     # Read ONE file for both normal lines and rdtsc lines
     blocks, rdtsc_map, matched, matched_rdtsc, total = read_slowdown_and_rdtsc_rows(slowdown_input_file)
 
-    method_to_comps, node_map = read_dot_node_map(loops_csv)
+    if dot_node_map is None:
+        dot_node_map = read_dot_node_map(loops_csv)
+    latest_comp, node_map = dot_node_map
+
+    # :: <-> . fallback names for the methods in the slowdown rows
+    method_aliases: Dict[str, str] = {}
+    if enable_method_fallback_match:
+        method_aliases = build_method_aliases(br.method_norm for br in blocks)
 
     # Existing vtune->graal mapping (for normal block lines)
     vtune_to_graal_by_method: Dict[str, Dict[int, int]] = {}
@@ -831,10 +936,17 @@ def build_totals_from_raw(
     graal_to_vtune_by_method = read_markerphase_graal_to_vtune(markerphase_json)
 
     # NEW: probe nodes per loop (graal block ids)
-    probe_blocks_by_loop = read_probe_nodes_csv(probe_nodes_csv)
+    if probe_blocks_by_loop is None:
+        probe_blocks_by_loop = read_probe_nodes_csv(probe_nodes_csv)
 
-    grouped: Dict[Tuple[int, str, int], LoopAgg] = defaultdict(LoopAgg)
+    # comp_id -> method_norm -> loop_id -> LoopAgg
+    grouped: Dict[int, Dict[str, Dict[int, LoopAgg]]] = defaultdict(lambda: defaultdict(lambda: defaultdict(LoopAgg)))
     block_rows: List[Tuple] = []
+    block_aggs: List[LoopAgg] = []
+    block_graal: List[int] = []
+    # float64 columns that NumPy can view without copying
+    block_normal = array.array("d")
+    block_slow = array.array("d")
 
     missing_methodblock = 0
     missing_block = 0
@@ -874,23 +986,20 @@ def build_totals_from_raw(
         comp_id = find_comp_for_method_block(
             method_norm,
             block_id_for_node_map,
-            method_to_comps,
-            node_map,
-            enable_method_fallback_match
+            latest_comp,
+            method_aliases,
         )
         if comp_id is None:
             missing_methodblock += 1
             continue
 
-        loop_id = node_map.get((comp_id, method_norm, block_id_for_node_map))
+        # the fallback may have matched the comp under the alias name only
+        loop_id = node_map[comp_id].get(method_norm, {}).get(block_id_for_node_map)
         if loop_id is None:
             missing_block += 1
             continue
 
-        g = grouped[(comp_id, method_norm, loop_id)]
-        g.num_blocks += 1
-        g.sum_normal += br.normal_time
-        g.sum_slow += br.slowdown_time
+        g = grouped[comp_id][method_norm][loop_id]
         used += 1
 
         block_rows.append((
@@ -899,68 +1008,66 @@ def build_totals_from_raw(
             loop_id,
             vtune_block_id if vtune_block_id is not None else "",
             graal_block_id if graal_block_id is not None else "",
-            br.normal_time,
-            br.slowdown_time,
-            safe_pct_increase(br.normal_time, br.slowdown_time),
         ))
+        block_aggs.append(g)
+        block_graal.append(graal_block_id)
+        block_normal.append(br.normal_time)
+        block_slow.append(br.slowdown_time)
 
     # --------------------------
-    # NEW: add probe RDTSC segment times per loop
+    # One walk over the loops in (comp_id, method, loop_id) order:
+    # NEW: add probe RDTSC segment times, and give each loop its gid
     # --------------------------
     probe_added_keys = 0
     probe_added_blocks = 0
     probe_missing_marker_map = 0
     probe_missing_rdtsc_line = 0
 
-    for (comp_id, method_norm, loop_id), g in grouped.items():
-        probe_graal_blocks = probe_blocks_by_loop.get((comp_id, method_norm, loop_id))
-        if not probe_graal_blocks:
-            continue
-
-        graal_to_vtune = graal_to_vtune_by_method.get(method_norm)
-        if not graal_to_vtune:
-            probe_missing_marker_map += len(probe_graal_blocks)
-            continue
-
-        any_added = False
-
-        for graal_bid in probe_graal_blocks:
-            vtune_bid = graal_to_vtune.get(graal_bid)
-            if vtune_bid is None:
-                probe_missing_marker_map += 1
-                continue
-
-            rr = rdtsc_map.get((method_norm, vtune_bid))
-            if rr is None:
-                probe_missing_rdtsc_line += 1
-                continue
-
-            g.probe_sum_normal += rr.rdtsc_normal
-            g.probe_sum_slow += rr.rdtsc_slow
-            probe_added_blocks += 1
-            any_added = True
-
-        if any_added:
-            probe_added_keys += 1
-
-    # loop totals (now include probe sums)
-    out_rows = []
-    for (comp_id, method_norm, loop_id), g in grouped.items():
-        total_n = g.sum_normal + g.probe_sum_normal
-        total_s = g.sum_slow + g.probe_sum_slow
-        pct = safe_pct_increase(total_n, total_s)
-
-        out_rows.append((
-            comp_id, method_norm, loop_id,
-            g.num_blocks,
-            total_n, total_s,
-            pct
-        ))
-
-    out_rows.sort(key=lambda r: (r[0], r[1], r[2]))
+    loop_keys: List[Tuple[int, str, int]] = []
+    probe_n_list: List[float] = []
+    probe_s_list: List[float] = []
+
+    for comp_id in sorted(grouped):
+        by_method = grouped[comp_id]
+        probes_by_method = probe_blocks_by_loop.get(comp_id, {})
+
+        for method_norm in sorted(by_method):
+            by_loop = by_method[method_norm]
+            probes_by_loop = probes_by_method.get(method_norm, {})
+            graal_to_vtune = graal_to_vtune_by_method.get(method_norm)
+
+            for loop_id in sorted(by_loop):
+                g = by_loop[loop_id]
+
+                probe_graal_blocks = probes_by_loop.get(loop_id)
+                if probe_graal_blocks:
+                    added, missing_map, missing_rdtsc = add_probe_segments(
+                        g, method_norm, probe_graal_blocks, graal_to_vtune, rdtsc_map
+                    )
+                    if added:
+                        probe_added_keys += 1
+                    probe_added_blocks += added
+                    probe_missing_marker_map += missing_map
+                    probe_missing_rdtsc_line += missing_rdtsc
+
+                g.gid = len(loop_keys)
+                loop_keys.append((comp_id, method_norm, loop_id))
+                probe_n_list.append(g.probe_sum_normal)
+                probe_s_list.append(g.probe_sum_slow)
+
+    # loop totals (now include probe sums): per-gid block counts and sums over the block columns.
+    # bincount accumulates in block order, exactly like a running per-loop sum.
+    num_loops = len(loop_keys)
+    gi = np.array([g.gid for g in block_aggs], dtype=np.intp)
+    n = np.frombuffer(block_normal, dtype=np.float64)
+    s = np.frombuffer(block_slow, dtype=np.float64)
+    num_blocks = np.bincount(gi, minlength=num_loops)
+    loop_n = np.bincount(gi, weights=n, minlength=num_loops) + np.array(probe_n_list, dtype=np.float64)
+    loop_s = np.bincount(gi, weights=s, minlength=num_loops) + np.array(probe_s_list, dtype=np.float64)
+    loop_pct = pct_increase_array(loop_n, loop_s)
 
     os.makedirs(os.path.dirname(output_loop_totals_csv) or ".", exist_ok=True)
-    with open(output_loop_totals_csv, "w", newline="", encoding="utf-8") as f:
+    with open(output_loop_totals_csv, "w", newline="", encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         w = csv.writer(f)
         w.writerow([
             "comp_id", "method", "loop_id",
@@ -968,32 +1075,27 @@ def build_totals_from_raw(
             "total_normal_time", "total_slowdown_time",
             "median_pct_slowdown"
         ])
-        w.writerows(out_rows)
-
-    # block map enriched (loop totals now include probe sums)
-    loop_totals: Dict[Tuple[int, str, int], Tuple[float, float, float]] = {}
-    for (comp_id, method_norm, loop_id), g in grouped.items():
-        tn = g.sum_normal + g.probe_sum_normal
-        ts = g.sum_slow + g.probe_sum_slow
-        loop_totals[(comp_id, method_norm, loop_id)] = (tn, ts, safe_pct_increase(tn, ts))
-
-    enriched_block_rows = []
-    for (comp_id, method_norm, loop_id, vtune_id, graal_id, n, s, pct_block) in block_rows:
-        tn, ts, pct_loop = loop_totals.get((comp_id, method_norm, loop_id), (0.0, 0.0, 0.0))
-        share_normal = (n / tn) if tn > 0.0 else 0.0
-        share_slow = (s / ts) if ts > 0.0 else 0.0
-        enriched_block_rows.append((
-            comp_id, method_norm, loop_id,
-            vtune_id, graal_id,
-            n, s, pct_block,
-            tn, ts, pct_loop,
-            share_normal, share_slow
-        ))
+        w.writerows(
+            key + rest
+            for key, rest in zip(loop_keys, zip(
+                num_blocks.tolist(), loop_n.tolist(), loop_s.tolist(), loop_pct.tolist()
+            ))
+        )
 
-    enriched_block_rows.sort(key=lambda r: (r[0], r[1], r[2], int(r[4]) if str(r[4]).isdigit() else 10**9))
+    # block map enriched (loop totals now include probe sums): gather each block's loop totals by gid.
+    # gid follows the sorted loop order, so ordering by (gid, graal block) gives the output order.
+    order = np.lexsort((np.array(block_graal, dtype=np.int64), gi))
+    gi = gi[order]
+    n = n[order]
+    s = s[order]
+    tn = loop_n[gi]
+    ts = loop_s[gi]
+    pct_block = pct_increase_array(n, s)
+    share_normal = np.divide(n, tn, out=np.zeros_like(n), where=tn > 0.0)
+    share_slow = np.divide(s, ts, out=np.zeros_like(s), where=ts > 0.0)
 
     os.makedirs(os.path.dirname(output_block_map_csv) or ".", exist_ok=True)
-    with open(output_block_map_csv, "w", newline="", encoding="utf-8") as f:
+    with open(output_block_map_csv, "w", newline="", encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         w = csv.writer(f)
         w.writerow([
             "comp_id", "method", "loop_id",
@@ -1002,7 +1104,14 @@ def build_totals_from_raw(
             "loop_total_normal_time", "loop_total_slowdown_time", "pct_increase_loop_total",
             "block_share_of_loop_normal", "block_share_of_loop_slowdown"
         ])
-        w.writerows(enriched_block_rows)
+        w.writerows(
+            block_rows[i] + rest
+            for i, rest in zip(order.tolist(), zip(
+                n.tolist(), s.tolist(), pct_block.tolist(),
+                tn.tolist(), ts.tolist(), loop_pct[gi].tolist(),
+                share_normal.tolist(), share_slow.tolist(),
+            ))
+        )
 
     print(f"[INFO] Read {total} lines, matched {matched} per-block lines.")
     print(f"[INFO] Matched {matched_rdtsc} RDTSC probe-segment lines (from the same file).")
@@ -1044,6 +1153,12 @@ def main() -> None:
     )
 
     ap.add_argument("--processed-dir", default="processed", help="Base processed output dir (default: processed).")
+    ap.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes for DOT parsing (default: all CPUs).",
+    )
     args = ap.parse_args()
 
     processed_dir = args.processed_dir
@@ -1061,14 +1176,13 @@ def main() -> None:
     dot_paths = write_dots_from_debug(args.debug_out, dots_dir)
     print(f"[OK] Wrote {len(dot_paths)} DOT files.")
 
-    # 2) dots -> loops.csv
+    # 2) dots -> loops.csv + probe_nodes.csv (one pass over the DOTs)
     print(f"[STEP] Writing loops CSV to: {loops_csv}")
-    nrows = write_loops_csv_from_dots(dots_dir, loops_csv)
-    print(f"[OK] loops.csv rows: {nrows}")
-
-    # 2.5) dots -> probe_nodes.csv (NEW)
     print(f"[STEP] Writing probe nodes CSV to: {probe_nodes_csv}")
-    pn = write_probe_nodes_csv_from_dots(dots_dir, probe_nodes_csv)
+    nrows, pn, dot_node_map, probe_blocks_by_loop = write_all_csvs_from_dots(
+        dots_dir, loops_csv, probe_nodes_csv, jobs=args.jobs
+    )
+    print(f"[OK] loops.csv rows: {nrows}")
     print(f"[OK] probe_nodes.csv rows: {pn}")
 
     # 3) slowdown + loops.csv (+ bridge) -> totals
@@ -1084,6 +1198,8 @@ def main() -> None:
         bridge_json=args.bridge_json,
         enable_method_fallback_match=(not args.no_method_fallback),
         min_normal_time_per_block=args.min_normal,
+        dot_node_map=dot_node_map,
+        probe_blocks_by_loop=probe_blocks_by_loop,
     )
 
 
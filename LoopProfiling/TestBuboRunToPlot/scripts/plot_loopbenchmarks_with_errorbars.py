@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 import csv
+import hashlib
+import math
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional
 
+import matplotlib
+matplotlib.use("Agg")  # file output only; skip GUI backend detection
 import matplotlib.pyplot as plt
+import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.lines as mlines
 
@@ -26,6 +33,13 @@ PLOTS_DIR = os.path.join(ROOT_DIR, "plots")
 OUT_PNG = os.path.join(PLOTS_DIR, "LoopBenchmarks_bubo_loops_median_errorbars2.png")
 OUT_CSV = os.path.join(PLOTS_DIR, "LoopBenchmarks_bubo_loops_median_errorbars2.csv")
 
+# Read buffer for the run CSVs (default is 8 KiB)
+CSV_READ_BUFFER = 1 << 20
+
+# Parsed run CSVs are pickled here and reused until the CSV changes
+CACHE_DIR = os.path.join(PLOTS_DIR, ".cache")
+CACHE_VERSION = 1  # bump when _aggregate_one's return value changes
+
 # Plot settings
 RUNTIME_SHARE_THRESHOLD = 2.0  # percent
 FIGSIZE = (20, 14.5)
@@ -52,14 +66,17 @@ legend_handles = [
 # HELPERS
 # ============================================================
 
-def median(xs: List[float]) -> float:
-    xs = sorted(xs)
-    n = len(xs)
+def median(xs) -> float:
+    # quickselect (np.partition) for the middle element(s), no full sort
+    a = np.asarray(xs, dtype=np.float64)
+    n = a.size
     if n == 0:
         return 0.0
-    if n % 2 == 1:
-        return xs[n // 2]
-    return (xs[n // 2 - 1] + xs[n // 2]) / 2.0
+    h = n // 2
+    if n & 1:
+        return float(np.partition(a, h)[h])
+    p = np.partition(a, [h - 1, h])
+    return float((p[h - 1] + p[h]) / 2.0)
 
 
 def parse_float(x: str) -> Optional[float]:
@@ -74,11 +91,8 @@ def parse_float(x: str) -> Optional[float]:
         return None
 
 
-@dataclass(frozen=True)
-class Key:
-    comp_id: int
-    loop_id: int
-    method: str
+# (comp_id, loop_id, method)
+Key = Tuple[int, int, str]
 
 
 @dataclass
@@ -110,33 +124,99 @@ class Agg:
 # LOAD + AGGREGATE
 # ============================================================
 
+def _aggregate_one(path: str) -> Dict[Key, Agg]:
+    """Per-run partial aggregate; runs in a worker process."""
+    agg: Dict[Key, Agg] = {}
+
+    with open(path, newline="", encoding="utf-8", errors="replace", buffering=CSV_READ_BUFFER) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return agg
+
+        # Column positions once per file instead of a dict per row
+        col = {name: i for i, name in enumerate(header)}
+        ncols = len(header)
+        i_comp_id = col["comp_id"]
+        i_loop_id = col["loop_id"]
+        i_method = col["method_dot"]
+        i_comp_name = col["comp_name"]
+        i_lcc = col["loop_call_count"]
+        i_slow = col.get("slowdown_pct")
+        i_share = col.get("runtime_share_pct")
+        i_vtune = col.get("loop_median_pct")
+        i_prog = col.get("prog_slowdown_pct")
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < ncols:
+                row += [""] * (ncols - len(row))
+
+            comp_id = int(row[i_comp_id])
+            loop_id = int(row[i_loop_id])
+            comp_name = row[i_comp_name]
+            method = row[i_method] or comp_name
+
+            key = (comp_id, loop_id, method)
+            a = agg.get(key)
+            if a is None:
+                a = agg[key] = Agg(comp_id, loop_id, method, comp_name, int(row[i_lcc]))
+
+            if i_slow is not None and (v := parse_float(row[i_slow])) is not None:
+                a.slowdown_vals.append(v)
+            if i_share is not None and (v := parse_float(row[i_share])) is not None:
+                a.runtime_share_vals.append(v)
+            if i_vtune is not None and (v := parse_float(row[i_vtune])) is not None:
+                a.vtune_vals.append(v)
+            if i_prog is not None and (v := parse_float(row[i_prog])) is not None:
+                a.prog_slowdown_vals.append(v)
+
+    return agg
+
+
+def _aggregate_one_cached(path: str) -> Dict[Key, Agg]:
+    """
+    _aggregate_one(path), memoized on disk under CACHE_DIR.
+
+    Entries are keyed on (path, mtime, size), so re-running a benchmark and
+    overwriting its CSV invalidates the entry automatically.
+    """
+    st = os.stat(path)
+    key = (CACHE_VERSION, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    cache_file = os.path.join(CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # stale or written by a different entry point; re-parse
+
+    part = _aggregate_one(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_file)
+    return part
+
+
 def load_and_aggregate(csv_paths: List[str]) -> Dict[Key, Agg]:
     agg: Dict[Key, Agg] = {}
 
-    for path in csv_paths:
-        with open(path, newline="", encoding="utf-8", errors="replace") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                comp_id = int(row["comp_id"])
-                loop_id = int(row["loop_id"])
-                method = row["method_dot"] or row["comp_name"]
-                comp_name = row["comp_name"]
-                lcc = int(row["loop_call_count"])
-
-                key = Key(comp_id, loop_id, method)
-                if key not in agg:
-                    agg[key] = Agg(comp_id, loop_id, method, comp_name, lcc)
-
-                a = agg[key]
-
-                if (v := parse_float(row.get("slowdown_pct", ""))) is not None:
-                    a.slowdown_vals.append(v)
-                if (v := parse_float(row.get("runtime_share_pct", ""))) is not None:
-                    a.runtime_share_vals.append(v)
-                if (v := parse_float(row.get("loop_median_pct", ""))) is not None:
-                    a.vtune_vals.append(v)
-                if (v := parse_float(row.get("prog_slowdown_pct", ""))) is not None:
-                    a.prog_slowdown_vals.append(v)
+    # Runs are parsed in parallel, then merged in input order so the
+    # first-seen row order (and each loop's comp_name/LCC) stays the same
+    with ProcessPoolExecutor() as ex:
+        for part in ex.map(_aggregate_one_cached, csv_paths):
+            for key, p in part.items():
+                a = agg.get(key)
+                if a is None:
+                    agg[key] = p
+                    continue
+                a.slowdown_vals.extend(p.slowdown_vals)
+                a.runtime_share_vals.extend(p.runtime_share_vals)
+                a.vtune_vals.extend(p.vtune_vals)
+                a.prog_slowdown_vals.extend(p.prog_slowdown_vals)
 
     return agg
 
@@ -155,16 +235,17 @@ def main():
         if not a.slowdown_vals:
             continue
 
-        vt = median(a.vtune_vals) if a.vtune_vals else ""
+        vt = median(a.vtune_vals) if a.vtune_vals else math.nan
+        slow = np.fromiter(a.slowdown_vals, np.float64, len(a.slowdown_vals))
         rows.append({
             "comp_id": a.comp_id,
             "loop_id": a.loop_id,
             "method": a.method,
             "comp_name": a.comp_name,
             "loop_call_count": a.loop_call_count,
-            "slow_median": median(a.slowdown_vals),
-            "slow_min": min(a.slowdown_vals),
-            "slow_max": max(a.slowdown_vals),
+            "slow_median": median(slow),
+            "slow_min": float(slow.min()),
+            "slow_max": float(slow.max()),
             "runtime_share": median(a.runtime_share_vals) if a.runtime_share_vals else 0.0,
             "vtune_median": vt,
             "prog_slowdown": median(a.prog_slowdown_vals) if a.prog_slowdown_vals else 0.0,
@@ -175,25 +256,32 @@ def main():
         print("[WARN] No rows aggregated from input CSVs")
         return
 
-    # Write aggregated CSV
+    # Write aggregated CSV as plain value lists, one writerows() call.
+    # NaN marks a missing VTune median in memory; the CSV keeps an empty cell.
+    fields = list(rows[0])
+    i_vt = fields.index("vtune_median")
+    out_rows = [list(r.values()) for r in rows]
+    for vals in out_rows:
+        if math.isnan(vals[i_vt]):
+            vals[i_vt] = ""
     with open(OUT_CSV, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=rows[0].keys())
-        w.writeheader()
-        w.writerows(rows)
+        w = csv.writer(f)
+        w.writerow(fields)
+        w.writerows(out_rows)
 
     # --- NEW: console diff stats (Bubo median vs VTune median) ---
     diff_rows = []
     for r in rows:
-        if r["vtune_median"] == "" or r["vtune_median"] is None:
+        vt = r["vtune_median"]
+        if math.isnan(vt):
             continue
-        vt = float(r["vtune_median"])
-        diff = float(r["slow_median"]) - vt  # percentage points
+        diff = r["slow_median"] - vt  # percentage points
         diff_rows.append({
             "comp_id": r["comp_id"],
             "loop_id": r["loop_id"],
             "method": r["method"],
-            "runtime_share": float(r["runtime_share"]),
-            "slow_median": float(r["slow_median"]),
+            "runtime_share": r["runtime_share"],
+            "slow_median": r["slow_median"],
             "vtune_median": vt,
             "diff_pp": diff,
             "abs_diff_pp": abs(diff),
@@ -243,37 +331,45 @@ def main():
     print()
 
     # Plot selection
-    plot_rows = [r for r in rows if float(r["runtime_share"]) >= RUNTIME_SHARE_THRESHOLD]
+    plot_rows = [r for r in rows if r["runtime_share"] >= RUNTIME_SHARE_THRESHOLD]
     if not plot_rows:
         print("[WARN] No loops pass runtime-share threshold")
         print(f"[OK] Wrote: {OUT_CSV}")
         return
 
-    plot_rows.sort(key=lambda r: float(r["runtime_share"]), reverse=True)
-    prog_slowdown = float(plot_rows[0]["prog_slowdown"])
+    plot_rows.sort(key=lambda r: r["runtime_share"], reverse=True)
+    prog_slowdown = plot_rows[0]["prog_slowdown"]
 
     labels = [
-        f"C{r['comp_id']} - L{r['loop_id']}\n{float(r['runtime_share']):.1f}%\n{r['method']}"
+        f"C{r['comp_id']} - L{r['loop_id']}\n{r['runtime_share']:.1f}%\n{r['method']}"
         for r in plot_rows
     ]
 
-    med_vals = [float(r["slow_median"]) for r in plot_rows]
-    lo_vals = [float(r["slow_min"]) for r in plot_rows]
-    hi_vals = [float(r["slow_max"]) for r in plot_rows]
-    yerr = [[m - l for m, l in zip(med_vals, lo_vals)], [h - m for m, h in zip(med_vals, hi_vals)]]
+    med_vals = [r["slow_median"] for r in plot_rows]
+    lo_vals = [r["slow_min"] for r in plot_rows]
+    hi_vals = [r["slow_max"] for r in plot_rows]
 
-    vtune_vals = [float(r["vtune_median"]) if r["vtune_median"] != "" else 0.0 for r in plot_rows]
-    colors = ["tab:blue" if int(r["loop_call_count"]) == 0 else "tab:orange" for r in plot_rows]
+    vtune_vals = [0.0 if math.isnan(r["vtune_median"]) else r["vtune_median"] for r in plot_rows]
+    colors = ["tab:blue" if r["loop_call_count"] == 0 else "tab:orange" for r in plot_rows]
 
     x = list(range(len(plot_rows)))
     w = 0.40
 
-    plt.figure(figsize=FIGSIZE)
-    ax = plt.gca()
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+
+    # Bubo and VTune bars go out as one bar() call with a per-bar color list
+    slow_x = [i - w/2 for i in x]
+    ax.bar(
+        slow_x + [i + w/2 for i in x],
+        med_vals + vtune_vals,
+        width=w,
+        color=colors + ["tab:gray"] * len(x),
+    )
 
-    ax.bar([i - w/2 for i in x], med_vals, width=w, color=colors)
-    ax.errorbar([i - w/2 for i in x], med_vals, yerr=yerr, fmt="none", capsize=3)
-    ax.bar([i + w/2 for i in x], vtune_vals, width=w, color="tab:gray")
+    # min..max whiskers as a single LineCollection, caps as one marker line
+    # (what errorbar(capsize=3) draws, without its per-call container setup)
+    ax.vlines(slow_x, lo_vals, hi_vals, colors="C0")
+    ax.plot(slow_x + slow_x, lo_vals + hi_vals, linestyle="none", marker="_", markersize=6, color="C0")
 
     ax.axhline(prog_slowdown, linestyle="--", linewidth=1)
     ax.set_xticks(x)
@@ -282,9 +378,9 @@ def main():
     ax.set_title(f"{BENCHMARK}: per-loop slowdown (median across runs)")
     ax.legend(handles=legend_handles, fontsize=9, loc="upper left")
 
-    plt.tight_layout()
-    plt.savefig(OUT_PNG, dpi=200)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(OUT_PNG, dpi=200)
+    plt.close(fig)
 
     print(f"[OK] Wrote: {OUT_PNG}")
     print(f"[OK] Wrote: {OUT_CSV}")
@@ -18,6 +18,7 @@ For each *.log in a logs directory:
 
 import csv
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 import matplotlib.pyplot as plt
@@ -33,23 +34,18 @@ OUT_PNG       = BASE_DIR / "awfy_benchmark_totals.png"
 
 # Example line:
 # Index : havlak.HavlakLoopFinder.findLoops() Activation Count : 84410209166
+# [^\S\n] keeps each match on one line now that the whole file is scanned at once
 LINE_RE = re.compile(
-    r"^Index\s*:\s*(.+?)\s+Activation Count\s*:\s*(-?\d+)\s*$"
+    r"^Index[^\S\n]*:[^\S\n]*(.+?)[^\S\n]+Activation Count[^\S\n]*:[^\S\n]*(-?\d+)[^\S\n]*$",
+    re.MULTILINE,
 )
 
 def parse_log(path: Path):
     """
     Return list[(index_name, count)] for one log file.
     """
-    rows = []
-    with path.open(encoding="utf-8", errors="replace") as f:
-        for line in f:
-            m = LINE_RE.match(line)
-            if m:
-                index_name = m.group(1).strip()
-                count = int(m.group(2))
-                rows.append((index_name, count))
-    return rows
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return [(m.group(1).strip(), int(m.group(2))) for m in LINE_RE.finditer(text)]
 
 def main():
     if not LOGS_DIR.exists():
@@ -58,25 +54,25 @@ def main():
     # benchmark -> list of (index_name, count)
     bench_rows = defaultdict(list)
 
-    # parse every .log
-    for log_path in sorted(LOGS_DIR.glob("*.log")):
-        bench_name = log_path.stem  # e.g. "Havlak"
-        rows = parse_log(log_path)
-        if rows:
-            bench_rows[bench_name].extend(rows)
+    # parse every .log, one worker process per file
+    log_paths = sorted(LOGS_DIR.glob("*.log"))
+    with ProcessPoolExecutor() as ex:
+        for log_path, rows in zip(log_paths, ex.map(parse_log, log_paths)):
+            bench_name = log_path.stem  # e.g. "Havlak"
+            if rows:
+                bench_rows[bench_name].extend(rows)
 
     # per-benchmark totals
     bench_totals = OrderedDict()
     for bench in sorted(bench_rows.keys()):
-        total = sum(count for _, count in bench_rows[bench])
-        bench_totals[bench] = total
+        bench_totals[bench] = sum(count for _, count in bench_rows[bench])
 
     # --- write long CSV of all rows ---
     OUT_ROWS_CSV.parent.mkdir(parents=True, exist_ok=True)
     with OUT_ROWS_CSV.open("w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow(["Benchmark", "Index", "Activation Count"])
-        for bench in sorted(bench_rows.keys()):
+        for bench in bench_totals:
             for idx_name, count in bench_rows[bench]:
                 w.writerow([bench, idx_name, count])
 
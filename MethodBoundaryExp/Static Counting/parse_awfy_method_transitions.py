@@ -10,6 +10,8 @@ Hard-coded paths. No CLI args.
 
 import csv
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 import matplotlib.pyplot as plt
@@ -30,6 +32,7 @@ PAIR_RE = re.compile(
     re.DOTALL
 )
 
+@lru_cache(maxsize=None)
 def normalize_comp_name(comp: str) -> str:
     """
     Normalize a comp string to compare with the CSV 'Compilation Unit'.
@@ -78,42 +81,37 @@ def main():
 
     # Keep LAST transitions per (benchmark, unit)
     # Initialize zeros for all allowed units so they appear even if unseen.
-    unit_last = defaultdict(lambda: defaultdict(int))  # bench -> unit -> last transitions
+    # (bench, unit) -> last transitions
+    unit_last = {(bench, u): 0 for bench, units in allowlist.items() for u in units}
 
-    # Touch defaults
-    for bench, units in allowlist.items():
-        for u in units:
-            _ = unit_last[bench][u]
+    # Walk logs (14 files); benchmarks without allow-list entries are skipped
+    log_paths = [p for p in sorted(LOGS_DIR.glob("*.log")) if allowlist.get(p.stem)]
 
-    # Walk logs (14 files)
-    for log_path in sorted(LOGS_DIR.glob("*.log")):
-        bench = log_path.stem  # Bounce, CD, ...
-        allowed_units = allowlist.get(bench, set())
-        if not allowed_units:
-            # No allow-list entries for this benchmark; skip.
-            continue
+    # Parse the files in parallel; results come back in log_paths order
+    with ProcessPoolExecutor() as ex:
+        parsed = list(ex.map(parse_log_file, log_paths))
 
-        pairs = parse_log_file(log_path)
+    for log_path, pairs in zip(log_paths, parsed):
+        bench = log_path.stem  # Bounce, CD, ...
         # IMPORTANT: use the LAST one seen for each unit
         for comp_raw, transitions in pairs:
-            comp_norm = normalize_comp_name(comp_raw)
-            if comp_norm in allowed_units:
-                unit_last[bench][comp_norm] = transitions  # overwrite with latest
+            key = (bench, normalize_comp_name(comp_raw))
+            if key in unit_last:
+                unit_last[key] = transitions  # overwrite with latest
 
     # Build per-benchmark totals (sum of last values across its units)
+    unit_rows = sorted(unit_last.items())
     bench_totals = OrderedDict()
-    for bench in sorted(unit_last.keys()):
-        total = sum(unit_last[bench].values())
-        bench_totals[bench] = total
+    for (bench, _), transitions in unit_rows:
+        bench_totals[bench] = bench_totals.get(bench, 0) + transitions
 
     # --- Write per-unit CSV (last transitions) ---
     OUT_UNITS_CSV.parent.mkdir(parents=True, exist_ok=True)
     with OUT_UNITS_CSV.open("w", newline='', encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow(["Benchmark", "Compilation Unit", "Last Transitions"])
-        for bench in sorted(unit_last.keys()):
-            for unit in sorted(unit_last[bench].keys()):
-                w.writerow([bench, unit, unit_last[bench][unit]])
+        for (bench, unit), transitions in unit_rows:
+            w.writerow([bench, unit, transitions])
 
     # --- Write per-benchmark totals CSV ---
     with OUT_BENCH_CSV.open("w", newline='', encoding="utf-8") as f:
@@ -16,6 +16,8 @@ both using log scales.
 
 import csv
 from pathlib import Path
+import matplotlib
+matplotlib.use("Agg")  # file output only; skip GUI backend detection
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 
@@ -91,8 +93,9 @@ def main():
     ax2.set_ylabel("Static Count (log scale)", color="tab:orange")
     ax2.tick_params(axis="y", labelcolor="tab:orange")
 
-    # format x-axis
-    plt.xticks(x, all_benchmarks, rotation=45, ha="right")
+    # format x-axis (shared, so setting it on either axes is the same)
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(all_benchmarks, rotation=45, ha="right")
 
     # tidy tick formatting
     for axis in (ax1.yaxis, ax2.yaxis):
@@ -103,9 +106,10 @@ def main():
         axis.set_major_locator(mticker.MaxNLocator(8))
 
     ax1.grid(True, which="both", axis="y", linestyle="--", alpha=0.3)
-    plt.title("Static vs Dynamic Counts per Benchmark (dual log scale)")
+    ax2.set_title("Static vs Dynamic Counts per Benchmark (dual log scale)")
     fig.tight_layout()
-    plt.savefig(OUT_PNG, dpi=200)
+    fig.savefig(OUT_PNG, dpi=200)
+    plt.close(fig)
 
     print(f"Wrote combined CSV: {OUT_CSV}")
     print(f"Wrote dual-axis plot: {OUT_PNG}")
@@ -1,10 +1,26 @@
 #!/usr/bin/env python3
 import os
 import csv
+import hashlib
+import io
+import pickle
 import re
 import subprocess
+import tempfile
 from collections import defaultdict
-from typing import Dict, Tuple, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Iterator, Tuple, List, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # fall back to plain Python if numba is not installed
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # ============================================================
 # Config defaults (override via CLI flags)
@@ -18,8 +34,8 @@ DEFAULT_JFR_BIN = "jfr"
 # Marker decode (matches your provided approach)
 # ============================================================
 
-_marker_re = re.compile(r"BuboAgentCompilerMarkers\.Marker(\d+)")
-_delim_re = re.compile(r"BuboAgentCompilerMarkers\.MarkerDelimiter")
+# One scan per frame: either the delimiter or a digit marker
+_FRAME_RE = re.compile(r"BuboAgentCompilerMarkers\.(?:Marker(?P<d>\d+)|(?P<delim>MarkerDelimiter))")
 
 
 def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
@@ -31,45 +47,181 @@ def decode_comp_loop_from_stack(frames: List[str]) -> Optional[Tuple[int, int]]:
 
     This is the same logic you provided. (Not the "tolerant" variant.)
     """
-    pre_digits: List[int] = []   # loop id
-    post_digits: List[int] = []  # comp id
+    # Marker digits are accumulated as running ints (Marker1, Marker2 -> 12)
+    loop_id = comp_id = 0
+    have_pre = have_post = False
     seen_delim = False
 
     for fn in frames:
-        if _delim_re.search(fn):
-            seen_delim = True
-            continue
-
-        m = _marker_re.search(fn)
+        m = _FRAME_RE.search(fn)
         if not m:
             # Once we've started seeing markers, stop when we hit non-marker.
-            if seen_delim or pre_digits:
+            if seen_delim or have_pre:
                 break
             else:
                 continue
 
-        digit = int(m.group(1))
+        if m.group("delim"):
+            seen_delim = True
+            continue
+
+        # shift by the digits of int(d), so zero-padded Marker007 appends "7"
+        d = int(m.group("d"))
+        shift = 10 ** len(str(d))
         if not seen_delim:
-            pre_digits.append(digit)
+            loop_id = loop_id * shift + d
+            have_pre = True
         else:
-            post_digits.append(digit)
+            comp_id = comp_id * shift + d
+            have_post = True
 
-    if not pre_digits or not post_digits:
+    if not have_pre or not have_post:
         return None
 
-    loop_id = int("".join(str(d) for d in pre_digits))
-    comp_id = int("".join(str(d) for d in post_digits))
-
     return comp_id, loop_id
 
 
+# ============================================================
+# Batched marker decode for the JFR path
+# ============================================================
+# Each frame is reduced to an int code (its marker number, or one of the
+# constants below) and a whole chunk of stacks is decoded in one jitted call.
+# Ids are unbounded, so a stack whose ids would not fit in int64 is flagged by
+# the kernel and decoded again with decode_comp_loop_from_stack.
+
+_CODE_DELIM = -1
+_CODE_OTHER = -2
+_CODE_BIG = -3  # marker number too large to shift in int64
+
+_MARKER_CODE_LIMIT = 10 ** 18  # larger marker numbers get _CODE_BIG
+_ID_MAX = (1 << 63) - 1
+
+# _decode_stacks per-stack result
+_STACK_NONE = 0  # decode_comp_loop_from_stack would return None
+_STACK_OK = 1
+_STACK_BIG = 2  # an id would pass _ID_MAX; decode in Python
+
+
+def _frame_code(fn: str) -> int:
+    m = _FRAME_RE.search(fn)
+    if not m:
+        return _CODE_OTHER
+    if m.group("delim"):
+        return _CODE_DELIM
+    d = int(m.group("d"))
+    return d if d < _MARKER_CODE_LIMIT else _CODE_BIG
+
+
+@njit(cache=True)
+def _decode_stacks(codes, offsets, comp_ids, loop_ids, state):
+    """
+    decode_comp_loop_from_stack over stack s = codes[offsets[s]:offsets[s + 1]],
+    writing comp_ids[s] / loop_ids[s] and state[s] (one of the _STACK_* values).
+    """
+    for s in range(len(offsets) - 1):
+        loop_id = 0
+        comp_id = 0
+        have_pre = False
+        have_post = False
+        seen_delim = False
+        big = False
+        for k in range(offsets[s], offsets[s + 1]):
+            c = codes[k]
+            if c == _CODE_OTHER:
+                if seen_delim or have_pre:
+                    break
+                continue
+            if c == _CODE_DELIM:
+                seen_delim = True
+                continue
+            if c == _CODE_BIG:
+                big = True
+                break
+            # shift by the marker's digit count (Marker12 appends "12")
+            shift = 10
+            v = c
+            while v >= 10:
+                v //= 10
+                shift *= 10
+            if not seen_delim:
+                if loop_id > (_ID_MAX - c) // shift:
+                    big = True
+                    break
+                loop_id = loop_id * shift + c
+                have_pre = True
+            else:
+                if comp_id > (_ID_MAX - c) // shift:
+                    big = True
+                    break
+                comp_id = comp_id * shift + c
+                have_post = True
+        comp_ids[s] = comp_id
+        loop_ids[s] = loop_id
+        if big:
+            state[s] = _STACK_BIG
+        elif have_pre and have_post:
+            state[s] = _STACK_OK
+        else:
+            state[s] = _STACK_NONE
+
+
+# Compile once at import so the first recording does not pay for it.
+_decode_stacks(
+    np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64),
+    np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8),
+)
+
+
+def _count_stacks(
+    stacks: List[List[str]], frame_codes: Dict[str, int], loop_samples: Dict[Tuple[int, int], int],
+) -> int:
+    """
+    Decode one batch of stacks (frame lists) into loop_samples; return how many
+    decoded. frame_codes caches _frame_code across batches.
+    """
+    n = len(stacks)
+    if n == 0:
+        return 0
+    codes: List[int] = []
+    offsets: List[int] = [0]
+    for frames in stacks:
+        for fn in frames:
+            c = frame_codes.get(fn)
+            if c is None:
+                c = frame_codes[fn] = _frame_code(fn)
+            codes.append(c)
+        offsets.append(len(codes))
+
+    comp_ids = np.empty(n, dtype=np.int64)
+    loop_ids = np.empty(n, dtype=np.int64)
+    state = np.empty(n, dtype=np.int8)
+    _decode_stacks(np.array(codes, dtype=np.int64), np.array(offsets, dtype=np.int64), comp_ids, loop_ids, state)
+
+    ok = state == _STACK_OK
+    keys, counts = np.unique(np.stack((comp_ids[ok], loop_ids[ok])), axis=1, return_counts=True)
+    for (comp_id, loop_id), c in zip(keys.T.tolist(), counts.tolist()):
+        loop_samples[(comp_id, loop_id)] += c
+    decoded = int(counts.sum())
+
+    # ids past int64 are rare; these few stacks take the arbitrary-precision path
+    for s in np.flatnonzero(state == _STACK_BIG).tolist():
+        key = decode_comp_loop_from_stack(stacks[s])
+        if key is not None:
+            loop_samples[key] += 1
+            decoded += 1
+    return decoded
+
+
 # ============================================================
 # Async GTAssignDebug tree parsing
 # ============================================================
 
-_ASYNC_TOTAL_RE = re.compile(r"\s*Total samples\s*:\s*(\d+)")
-_ASYNC_BLOCK_RE = re.compile(r"^---\s+.*,\s*(\d+)\s+samples")
-_ASYNC_FRAME_RE = re.compile(r"\s*\[\s*\d+\]\s+(.+)")
+# All patterns run over the whole file; [^\S\n] keeps each match on one line
+_ASYNC_TOTAL_RE = re.compile(r"^[^\S\n]*Total samples[^\S\n]*:[^\S\n]*(\d+)", re.M)
+_ASYNC_BLOCK_RE = re.compile(r"^---[^\S\n]+.*,[^\S\n]*(\d+)[^\S\n]+samples", re.M)
+_ASYNC_FRAME_RE = re.compile(r"^[^\S\n]*\[[^\S\n]*\d+\][^\S\n]+(.+)", re.M)
+# A block's frames run until the next '---' line or the first blank line
+_ASYNC_BLOCK_END_RE = re.compile(r"^(?:---|[^\S\n]*$)", re.M)
 
 
 def parse_async_tree(path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
@@ -81,44 +233,27 @@ def parse_async_tree(path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
       {(comp_id, loop_id) -> samples_accumulated_from_blocks_that_decode}
     """
     with open(path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
+        text = f.read()
 
-    total_samples = 0
-    for line in lines:
-        m = _ASYNC_TOTAL_RE.match(line)
-        if m:
-            total_samples = int(m.group(1))
-            break
+    m = _ASYNC_TOTAL_RE.search(text)
+    total_samples = int(m.group(1)) if m else 0
 
     loop_samples: Dict[Tuple[int, int], int] = defaultdict(int)
 
-    i, n = 0, len(lines)
-    while i < n:
-        line = lines[i]
-        m = _ASYNC_BLOCK_RE.match(line)
-        if not m:
-            i += 1
-            continue
-
+    for m in _ASYNC_BLOCK_RE.finditer(text):
         block_samples = int(m.group(1))
-        i += 1
 
-        frames: List[str] = []
-        while i < n:
-            l2 = lines[i]
-            if l2.strip() == "" or l2.startswith("---"):
-                break
-            fm = _ASYNC_FRAME_RE.match(l2)
-            if fm:
-                frames.append(fm.group(1).strip())
-            i += 1
+        # Frames start on the line after the header
+        start = text.find("\n", m.end()) + 1 or len(text)
+        end_m = _ASYNC_BLOCK_END_RE.search(text, start)
+        end = end_m.start() if end_m else len(text)
+
+        frames = [s.strip() for s in _ASYNC_FRAME_RE.findall(text, start, end)]
 
         key = decode_comp_loop_from_stack(frames)
         if key is not None:
             loop_samples[key] += block_samples
 
-        # note: do not i += 1 here; we want to re-process next '---' if present
-
     return total_samples, dict(loop_samples)
 
 
@@ -126,15 +261,52 @@ def parse_async_tree(path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
 # JFR parsing via `jfr print --events jdk.ExecutionSample`
 # ============================================================
 
-def jfr_print_exec_samples(jfr_bin: str, jfr_path: str) -> List[str]:
-    proc = subprocess.run(
+# `jfr print` stdout is consumed in chunks of this many characters
+JFR_READ_CHUNK = 1 << 20
+
+# One stackTrace block: frames run until a line starting with ']' (or, for a
+# truncated block, the next jdk.ExecutionSample header)
+_JFR_STACK_END = r"[^\S\n]*(?:\]|jdk\.ExecutionSample \{)"
+_JFR_STACK_RE = re.compile(
+    r"stackTrace = \[[^\n]*\n"
+    rf"((?:(?!{_JFR_STACK_END})[^\n]*\n)*)"
+    + _JFR_STACK_END
+)
+# A non-blank frame line, stripped and without its trailing comma(s)
+_JFR_FRAME_RE = re.compile(r"^[^\S\n]*([^\n]*[^\s,])", re.M)
+
+
+def _jfr_unterminated_frames(tail: str) -> List[str]:
+    """
+    Frames of a stackTrace block left open at the end of the output (no ']',
+    e.g. truncated `jfr print` output); [] if there is none.
+    """
+    start = tail.rfind("stackTrace = [")
+    if start < 0:
+        return []
+    nl = tail.find("\n", start)
+    return _JFR_FRAME_RE.findall(tail, nl + 1) if nl >= 0 else []
+
+
+def jfr_print_exec_samples(jfr_bin: str, jfr_path: str) -> Iterator[str]:
+    """
+    Stream `jfr print --events jdk.ExecutionSample <file>` stdout in
+    JFR_READ_CHUNK-sized pieces instead of buffering the whole dump. stderr
+    goes to a temp file so jfr can't stall on a full pipe while we are still
+    reading stdout.
+    """
+    with tempfile.TemporaryFile() as err, subprocess.Popen(
         [jfr_bin, "print", "--events", "jdk.ExecutionSample", jfr_path],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=err,
         text=True,
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(f"jfr print failed for {jfr_path}:\n{proc.stdout}\n{proc.stderr}")
-    return proc.stdout.splitlines()
+    ) as proc:
+        yield from iter(lambda: proc.stdout.read(JFR_READ_CHUNK), "")
+        if proc.wait() != 0:
+            err.seek(0)
+            raise RuntimeError(
+                f"jfr print failed for {jfr_path}:\n{err.read().decode(errors='replace')}"
+            )
 
 
 def parse_jfr_report(jfr_bin: str, jfr_path: str) -> Tuple[int, Dict[Tuple[int, int], int]]:
@@ -145,47 +317,31 @@ def parse_jfr_report(jfr_bin: str, jfr_path: str) -> Tuple[int, Dict[Tuple[int,
     if not os.path.isfile(jfr_path):
         raise FileNotFoundError(jfr_path)
 
-    lines = jfr_print_exec_samples(jfr_bin, jfr_path)
-
     total_samples = 0
     loop_samples: Dict[Tuple[int, int], int] = defaultdict(int)
 
-    in_stack = False
-    current_stack: List[str] = []
-
-    def flush_stack():
-        nonlocal total_samples, current_stack
-        if not current_stack:
-            return
-        key = decode_comp_loop_from_stack(current_stack)
+    # Complete stackTrace blocks are decoded straight out of the buffer;
+    # whatever follows the last one is kept for the next chunk
+    buf = ""
+    frame_codes: Dict[str, int] = {}  # frame text -> code; frames repeat a lot
+    for chunk in jfr_print_exec_samples(jfr_bin, jfr_path):
+        buf += chunk
+        end = 0
+        stacks: List[List[str]] = []
+        for m in _JFR_STACK_RE.finditer(buf):
+            end = m.end()
+            stacks.append(_JFR_FRAME_RE.findall(m.group(1)))
+        buf = buf[end:]
+        total_samples += _count_stacks(stacks, frame_codes, loop_samples)
+
+    # A last block cut off before its ']' still counts as one sample
+    frames = _jfr_unterminated_frames(buf)
+    if frames:
+        key = decode_comp_loop_from_stack(frames)
         if key is not None:
             loop_samples[key] += 1
             total_samples += 1
-        current_stack = []
-
-    for line in lines:
-        s = line.strip()
-
-        if s.startswith("jdk.ExecutionSample {"):
-            flush_stack()
-            in_stack = False
-            continue
 
-        if "stackTrace = [" in s:
-            in_stack = True
-            current_stack = []
-            continue
-
-        if in_stack:
-            if s.startswith("]"):
-                flush_stack()
-                in_stack = False
-                continue
-            if s:
-                current_stack.append(s.rstrip(","))
-            continue
-
-    flush_stack()
     return total_samples, dict(loop_samples)
 
 
@@ -197,6 +353,41 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+# CSV output is written through a buffer of this many bytes
+CSV_WRITE_BUFFER = 1 << 20
+
+
+def _write_csv(out_csv: str, header: List[str], prefix: Tuple[str, ...], rows: Iterable[tuple]) -> None:
+    """
+    Write header, then one line per row: the prefix fields every row shares,
+    followed by that row's fields. Row fields must be numbers (or "").
+    """
+    # The shared prefix is quoted by csv once. Row fields never need quoting
+    # and str() formats them as csv.writer would, so they are joined directly.
+    buf = io.StringIO()
+    csv.writer(buf).writerow((*prefix, ""))
+    lead = buf.getvalue()[:-2]  # drop the "\r\n" terminator, keep the trailing ","
+
+    with open(out_csv, "w", newline="", buffering=CSV_WRITE_BUFFER) as f:
+        csv.writer(f).writerow(header)
+        f.writelines(lead + ",".join(map(str, row)) + "\r\n" for row in rows)
+
+
+def _counts_arrays(counts: Dict[Tuple[int, int], int]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Split a {(comp_id, loop_id) -> samples} map into (n, 2) key and (n,)
+    sample arrays, or None when an id does not fit in int64 (the async decoder
+    keeps arbitrary-precision ids).
+    """
+    lo = -_ID_MAX - 1
+    if not all(lo <= comp_id <= _ID_MAX and lo <= loop_id <= _ID_MAX for comp_id, loop_id in counts):
+        return None
+    n = len(counts)
+    keys = np.array(list(counts), dtype=np.int64).reshape(n, 2)
+    samples = np.fromiter(counts.values(), dtype=np.int64, count=n)
+    return keys, samples
+
+
 def write_counts_csv(
     out_csv: str,
     tool: str,
@@ -205,28 +396,33 @@ def write_counts_csv(
     total: int,
     counts: Dict[Tuple[int, int], int],
 ) -> None:
-    ensure_dir(os.path.dirname(out_csv) or ".")
-    rows = []
-    for (comp_id, loop_id), samples in sorted(counts.items()):
-        rows.append({
-            "tool": tool,
-            "benchmark": benchmark,
-            "run_type": run_type,
-            "comp_id": comp_id,
-            "loop_id": loop_id,
-            "samples": samples,
-            "total_samples": total,
-            "runtime_share_pct": (samples / total * 100.0) if total > 0 else 0.0,
-        })
-
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "tool", "benchmark", "run_type",
-            "comp_id", "loop_id",
-            "samples", "total_samples", "runtime_share_pct",
-        ])
-        w.writeheader()
-        w.writerows(rows)
+    # samples / denom * scale is bit-identical to samples / total * 100.0 when
+    # total > 0 and gives 0.0 otherwise, so rows need no per-row branch
+    denom, scale = (total, 100.0) if total > 0 else (1, 0.0)
+
+    arrays = _counts_arrays(counts)
+    if arrays is None:
+        # ids past int64: sort and compute per row on Python ints
+        rows = (
+            (comp_id, loop_id, n, total, n / denom * scale)
+            for (comp_id, loop_id), n in sorted(counts.items())
+        )
+    else:
+        keys, samples = arrays
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        keys, samples = keys[order], samples[order]
+        pct = samples / denom * scale
+        rows = (
+            (comp_id, loop_id, n, total, p)
+            for comp_id, loop_id, n, p in zip(
+                keys[:, 0].tolist(), keys[:, 1].tolist(), samples.tolist(), pct.tolist())
+        )
+
+    _write_csv(out_csv, [
+        "tool", "benchmark", "run_type",
+        "comp_id", "loop_id",
+        "samples", "total_samples", "runtime_share_pct",
+    ], (tool, benchmark, run_type), rows)
 
 
 def write_slowdown_csv(
@@ -238,41 +434,89 @@ def write_slowdown_csv(
     slow_total: int,
     slow_counts: Dict[Tuple[int, int], int],
 ) -> None:
-    ensure_dir(os.path.dirname(out_csv) or ".")
-    keys = sorted(set(base_counts.keys()) | set(slow_counts.keys()))
-    rows = []
-    for comp_id, loop_id in keys:
-        b = base_counts.get((comp_id, loop_id), 0)
-        s = slow_counts.get((comp_id, loop_id), 0)
-        if b == 0:
-            # can't compute relative change; keep row but mark pct empty-ish
-            slowdown_pct = ""
-        else:
-            slowdown_pct = (s - b) / b * 100.0
-
-        rows.append({
-            "tool": tool,
-            "benchmark": benchmark,
-            "comp_id": comp_id,
-            "loop_id": loop_id,
-            "baseline_samples": b,
-            "slowdown_samples": s,
-            "slowdown_pct": slowdown_pct,
-            "runtime_share_pct_slow": (s / slow_total * 100.0) if slow_total > 0 else 0.0,
-            "total_samples_baseline": base_total,
-            "total_samples_slowdown": slow_total,
-        })
-
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "tool", "benchmark",
-            "comp_id", "loop_id",
-            "baseline_samples", "slowdown_samples", "slowdown_pct",
-            "runtime_share_pct_slow",
-            "total_samples_baseline", "total_samples_slowdown",
-        ])
-        w.writeheader()
-        w.writerows(rows)
+    slow_denom, slow_scale = (slow_total, 100.0) if slow_total > 0 else (1, 0.0)
+    base_arrays = _counts_arrays(base_counts)
+    slow_arrays = _counts_arrays(slow_counts)
+
+    if base_arrays is None or slow_arrays is None:
+        # ids past int64: merge and compute per key on Python ints
+        keys = sorted(base_counts.keys() | slow_counts.keys())
+        b = [base_counts.get(k, 0) for k in keys]
+        s = [slow_counts.get(k, 0) for k in keys]
+        pct = [(sn - bn) / bn * 100.0 if bn else 0.0 for bn, sn in zip(b, s)]
+        share = [sn / slow_denom * slow_scale for sn in s]
+    else:
+        base_keys, base_samples = base_arrays
+        slow_keys, slow_samples = slow_arrays
+
+        # One np.unique over both sides' key rows gives the sorted key union; the
+        # inverse index scatters each side's samples into place (missing -> 0)
+        key_arr, inv = np.unique(np.concatenate((base_keys, slow_keys)), axis=0, return_inverse=True)
+        inv = inv.reshape(-1)
+        nb = len(base_samples)
+        b_arr = np.zeros(len(key_arr), dtype=np.int64)
+        b_arr[inv[:nb]] = base_samples
+        s_arr = np.zeros(len(key_arr), dtype=np.int64)
+        s_arr[inv[nb:]] = slow_samples
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_arr = (s_arr - b_arr) / b_arr * 100.0
+        keys = key_arr.tolist()
+        b, s = b_arr.tolist(), s_arr.tolist()
+        pct = pct_arr.tolist()
+        share = (s_arr / slow_denom * slow_scale).tolist()
+
+    # Row tuples are generated while writing; no list of them is built
+    def rows():
+        for (comp_id, loop_id), bn, sn, p, sh in zip(keys, b, s, pct, share):
+            yield (
+                comp_id, loop_id, bn, sn,
+                # can't compute relative change without a baseline; keep row but leave pct empty
+                p if bn else "",
+                sh, base_total, slow_total,
+            )
+
+    _write_csv(out_csv, [
+        "tool", "benchmark",
+        "comp_id", "loop_id",
+        "baseline_samples", "slowdown_samples", "slowdown_pct",
+        "runtime_share_pct_slow",
+        "total_samples_baseline", "total_samples_slowdown",
+    ], (tool, benchmark), rows())
+
+
+# ============================================================
+# Parse cache
+# ============================================================
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 2  # bump when a parser's return value changes
+
+
+def cached_parse(parse, path: str, cache_dir: str, *args):
+    """
+    Return parse(*args, path), memoized on disk under cache_dir.
+
+    Entries are keyed on (parser, path, mtime, size), so re-recording a run
+    invalidates its entry automatically.
+    """
+    st = os.stat(path)
+    key = (CACHE_VERSION, parse.__name__, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    cache_file = os.path.join(cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # truncated or unreadable entry; re-parse
+
+    result = parse(*args, path)
+    ensure_dir(cache_dir)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_file)
+    return result
 
 
 # ============================================================
@@ -280,17 +524,26 @@ def write_slowdown_csv(
 # ============================================================
 
 def find_benchmarks(base_dir: str) -> List[str]:
+    """
+    Benchmark folder names under base_dir, in inode order rather than by name:
+    on a cold cache that walks the inode table forwards instead of seeking
+    around it. Callers that print them sort the names themselves.
+    """
     if not os.path.isdir(base_dir):
         raise SystemExit(f"Base dir not found: {base_dir}")
-    bms = []
-    for d in sorted(os.listdir(base_dir)):
-        p = os.path.join(base_dir, d)
-        if os.path.isdir(p):
-            bms.append(d)
-    return bms
+    # DirEntry.is_dir() / inode() answer from the readdir entry where they can, no stat per entry
+    with os.scandir(base_dir) as it:
+        return [name for _, name in sorted((e.inode(), e.name) for e in it if e.is_dir())]
 
 
-def parse_one_benchmark(base_dir: str, out_dir: str, jfr_bin: str, benchmark: str) -> None:
+def parse_one_benchmark(
+    base_dir: str, out_dir: str, jfr_bin: str, benchmark: str, use_cache: bool = True,
+) -> List[str]:
+    """
+    Parse and write one benchmark's CSVs. Runs in a worker process, so status
+    lines are returned for main() to print rather than printed here.
+    """
+    log: List[str] = []
     bm_dir = os.path.join(base_dir, benchmark)
 
     # Expected names (matches your conventions)
@@ -299,59 +552,72 @@ def parse_one_benchmark(base_dir: str, out_dir: str, jfr_bin: str, benchmark: st
     jfr_no = os.path.join(bm_dir, f"{benchmark}_noSlow.jfr")
     jfr_sl = os.path.join(bm_dir, f"{benchmark}_slowdown.jfr")
 
+    # One stat per input; every guard below reuses these
+    have_async_no = os.path.isfile(async_no)
+    have_async_sl = os.path.isfile(async_sl)
+    have_jfr_no = os.path.isfile(jfr_no)
+    have_jfr_sl = os.path.isfile(jfr_sl)
+
+    cache_dir = os.path.join(out_dir, CACHE_DIR_NAME)
+
+    def parse(fn, path, *args):
+        return cached_parse(fn, path, cache_dir, *args) if use_cache else fn(*args, path)
+
+    # Start all four parses at once: both `jfr print` subprocesses run side by
+    # side and their pipe waits overlap with the async-tree parsing
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        async_no_f = ex.submit(parse, parse_async_tree, async_no) if have_async_no else None
+        async_sl_f = ex.submit(parse, parse_async_tree, async_sl) if have_async_sl else None
+        jfr_no_f = ex.submit(parse, parse_jfr_report, jfr_no, jfr_bin) if have_jfr_no else None
+        jfr_sl_f = ex.submit(parse, parse_jfr_report, jfr_sl, jfr_bin) if have_jfr_sl else None
+
     # --- Async ---
-    async_no_total, async_no_counts = (0, {})
-    async_sl_total, async_sl_counts = (0, {})
-    if os.path.isfile(async_no):
-        async_no_total, async_no_counts = parse_async_tree(async_no)
-    if os.path.isfile(async_sl):
-        async_sl_total, async_sl_counts = parse_async_tree(async_sl)
-
-    if os.path.isfile(async_no):
+    async_no_total, async_no_counts = async_no_f.result() if async_no_f else (0, {})
+    async_sl_total, async_sl_counts = async_sl_f.result() if async_sl_f else (0, {})
+
+    if have_async_no:
         out_csv = os.path.join(out_dir, "async_counts", f"{benchmark}_noSlow_async.csv")
         write_counts_csv(out_csv, "async", benchmark, "noSlow", async_no_total, async_no_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing async noSlow file: {async_no}")
+        log.append(f"[WARN] {benchmark}: missing async noSlow file: {async_no}")
 
-    if os.path.isfile(async_sl):
+    if have_async_sl:
         out_csv = os.path.join(out_dir, "async_counts", f"{benchmark}_slowdown_async.csv")
         write_counts_csv(out_csv, "async", benchmark, "slowdown", async_sl_total, async_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing async slowdown file: {async_sl}")
+        log.append(f"[WARN] {benchmark}: missing async slowdown file: {async_sl}")
 
-    if os.path.isfile(async_no) and os.path.isfile(async_sl):
+    if have_async_no and have_async_sl:
         out_csv = os.path.join(out_dir, "async_slowdown", f"{benchmark}_async_slowdown.csv")
         write_slowdown_csv(out_csv, "async", benchmark, async_no_total, async_no_counts, async_sl_total, async_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
 
     # --- JFR ---
-    jfr_no_total, jfr_no_counts = (0, {})
-    jfr_sl_total, jfr_sl_counts = (0, {})
-    if os.path.isfile(jfr_no):
-        jfr_no_total, jfr_no_counts = parse_jfr_report(jfr_bin, jfr_no)
-    if os.path.isfile(jfr_sl):
-        jfr_sl_total, jfr_sl_counts = parse_jfr_report(jfr_bin, jfr_sl)
-
-    if os.path.isfile(jfr_no):
+    jfr_no_total, jfr_no_counts = jfr_no_f.result() if jfr_no_f else (0, {})
+    jfr_sl_total, jfr_sl_counts = jfr_sl_f.result() if jfr_sl_f else (0, {})
+
+    if have_jfr_no:
         out_csv = os.path.join(out_dir, "jfr_counts", f"{benchmark}_noSlow_jfr.csv")
         write_counts_csv(out_csv, "jfr", benchmark, "noSlow", jfr_no_total, jfr_no_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing JFR noSlow file: {jfr_no}")
+        log.append(f"[WARN] {benchmark}: missing JFR noSlow file: {jfr_no}")
 
-    if os.path.isfile(jfr_sl):
+    if have_jfr_sl:
         out_csv = os.path.join(out_dir, "jfr_counts", f"{benchmark}_slowdown_jfr.csv")
         write_counts_csv(out_csv, "jfr", benchmark, "slowdown", jfr_sl_total, jfr_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
     else:
-        print(f"[WARN] {benchmark}: missing JFR slowdown file: {jfr_sl}")
+        log.append(f"[WARN] {benchmark}: missing JFR slowdown file: {jfr_sl}")
 
-    if os.path.isfile(jfr_no) and os.path.isfile(jfr_sl):
+    if have_jfr_no and have_jfr_sl:
         out_csv = os.path.join(out_dir, "jfr_slowdown", f"{benchmark}_jfr_slowdown.csv")
         write_slowdown_csv(out_csv, "jfr", benchmark, jfr_no_total, jfr_no_counts, jfr_sl_total, jfr_sl_counts)
-        print(f"[OK] {benchmark}: wrote {out_csv}")
+        log.append(f"[OK] {benchmark}: wrote {out_csv}")
+
+    return log
 
 
 def main():
@@ -361,6 +627,10 @@ def main():
     ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Where to write CSVs.")
     ap.add_argument("--jfr-bin", default=DEFAULT_JFR_BIN, help="Path/name of the 'jfr' tool.")
     ap.add_argument("--benchmark", default=None, help="If set, only parse this benchmark folder name.")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                    help="Worker processes; benchmarks are parsed in parallel (default: CPU count).")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Re-parse every input instead of reusing <out-dir>/{CACHE_DIR_NAME}.")
     args = ap.parse_args()
 
     if args.benchmark:
@@ -370,10 +640,23 @@ def main():
 
     print("[INFO] base-dir:", args.base_dir)
     print("[INFO] out-dir :", args.out_dir)
-    print("[INFO] benchmarks:", ", ".join(benchmarks) if benchmarks else "<none>")
-
-    for bm in benchmarks:
-        parse_one_benchmark(args.base_dir, args.out_dir, args.jfr_bin, bm)
+    print("[INFO] benchmarks:", ", ".join(sorted(benchmarks)) if benchmarks else "<none>")
+
+    # Every CSV lands in one of these; create them here once rather than per file
+    for sub in ("async_counts", "async_slowdown", "jfr_counts", "jfr_slowdown"):
+        ensure_dir(os.path.join(args.out_dir, sub))
+
+    # Each benchmark's async dumps / jfr recordings are independent, so give
+    # every benchmark its own worker. Logs come back per benchmark and are
+    # printed here by name, so output never interleaves across workers and
+    # does not depend on the on-disk traversal order.
+    parse_bm = partial(parse_one_benchmark, args.base_dir, args.out_dir, args.jfr_bin,
+                       use_cache=not args.no_cache)
+    with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+        logs = dict(zip(benchmarks, ex.map(parse_bm, benchmarks)))
+    for benchmark in sorted(logs):
+        for line in logs[benchmark]:
+            print(line)
 
 
 if __name__ == "__main__":